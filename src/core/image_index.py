@@ -228,16 +228,20 @@ class ImageIndex:
         query = 'SELECT * FROM images WHERE 1=1'
         params = []
         
+        # Prompt terms are matched with SQLite's LIKE, which is already
+        # case-insensitive for ASCII (the same folding LOWER() applies), so
+        # the prompt column is scanned in place without a per-row copy.
+        
         # Include terms - all must match
         if include_terms:
             for term in include_terms:
-                query += ' AND LOWER(prompt) LIKE ?'
+                query += ' AND prompt LIKE ?'
                 params.append(f'%{term.lower()}%')
         
         # Exclude terms - none must match
         if exclude_terms:
             for term in exclude_terms:
-                query += ' AND LOWER(prompt) NOT LIKE ?'
+                query += ' AND prompt NOT LIKE ?'
                 params.append(f'%{term.lower()}%')
         
         # Model filter
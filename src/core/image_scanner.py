@@ -123,15 +123,28 @@ class ImageScanner:
             raise NotADirectoryError(f"Not a directory: {directory}")
         
         image_files = []
+        extensions = self.SUPPORTED_EXTENSIONS
         
-        if recursive:
-            for path in dir_path.rglob('*'):
-                if path.is_file() and path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                    image_files.append(path)
-        else:
-            for path in dir_path.iterdir():
-                if path.is_file() and path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                    image_files.append(path)
+        # Walk with os.scandir so file/dir types come from the directory
+        # entries themselves instead of one stat() call per path
+        pending = [str(dir_path)]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                if os.path.splitext(entry.name)[1].lower() in extensions:
+                                    image_files.append(Path(entry.path))
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                if current == str(dir_path):
+                    raise
+                # Unreadable subdirectory - skip it like rglob does
         
         # Sort for consistent ordering
         image_files.sort()
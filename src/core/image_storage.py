@@ -1,14 +1,34 @@
 """Full image storage system with SQLite BLOB storage."""
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
 import shutil
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from collections import defaultdict
 from datetime import datetime
 import hashlib
 
 from ..models.image_data import ImageMetadata
 
+# Statements issued repeatedly; keeping one string per statement lets
+# sqlite3's per-connection statement cache reuse the compiled form
+_SQL_DELETE_BY_PATH = 'DELETE FROM stored_images WHERE original_path = ?'
+_SQL_MARK_DELETED_BY_PATH = 'UPDATE stored_images SET original_deleted = 1 WHERE original_path = ?'
+_SQL_SELECT_IMAGE_DATA = 'SELECT image_data FROM stored_images WHERE original_path = ?'
+_SQL_SELECT_ALL_METADATA = '''
+    SELECT id, original_path, file_name, file_hash, file_size,
+           width, height, prompt, negative_prompt, model, model_hash,
+           sampler, steps, cfg_scale, seed, source, raw_metadata,
+           extra_params, stored_at, original_deleted
+    FROM stored_images ORDER BY stored_at DESC
+'''
+_SQL_SELECT_ROWIDS = 'SELECT rowid FROM stored_images ORDER BY stored_at DESC'
+_SQL_SELECT_PATHS = 'SELECT original_path FROM stored_images'
+_SQL_SELECT_HASH_BY_PATH = 'SELECT file_hash FROM stored_images WHERE original_path = ?'
+
 
 class ImageStorage:
     """
@@ -16,6 +36,9 @@ class ImageStorage:
     Stores both metadata and image file data as BLOBs.
     """
     
+    READ_POOL_SIZE = 4  # Read-only connections available to concurrent readers
+    CACHED_STATEMENTS = 256  # Compiled statements kept per connection
+    
     def __init__(self, db_path: str = None):
         """
         Initialize image storage.
@@ -27,9 +50,54 @@ class ImageStorage:
             db_path = os.path.expanduser("~/.cache/sd-image-viewer/image_storage.db")
         
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, cached_statements=self.CACHED_STATEMENTS)
         self.conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside an import; NORMAL sync is safe with WAL
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-64000')
+        # Table statistics, recomputed only after a write (see get_storage_stats)
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_version: Optional[int] = None
         self._create_tables()
+        
+        # Read-only connections shared by any thread; self.conn stays the sole writer.
+        # They are opened on demand by read_conn, so instances that only write
+        # (import and cleanup workers) hold a single connection.
+        # An in-memory database is private to self.conn, so reads go through it.
+        self._in_memory = db_path in ('', ':memory:')
+        self._ro_pool: queue.Queue = queue.Queue()
+        self._ro_lock = threading.Lock()
+        self._ro_open = 0  # Read-only connections opened so far
+        # as_uri() percent-encodes characters such as '?' and '#' in the path
+        self._ro_uri = None if self._in_memory else Path(db_path).resolve().as_uri() + '?mode=ro'
+    
+    def _checkout_read_conn(self) -> sqlite3.Connection:
+        """Take an idle read-only connection, opening one while under READ_POOL_SIZE."""
+        try:
+            return self._ro_pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._ro_lock:
+            can_open = self._ro_open < self.READ_POOL_SIZE
+            if can_open:
+                self._ro_open += 1
+        if not can_open:
+            return self._ro_pool.get()
+        
+        try:
+            ro_conn = sqlite3.connect(self._ro_uri, uri=True, check_same_thread=False,
+                                      cached_statements=self.CACHED_STATEMENTS)
+        except sqlite3.Error:
+            with self._ro_lock:
+                self._ro_open -= 1
+            raise
+        ro_conn.row_factory = sqlite3.Row
+        ro_conn.execute('PRAGMA query_only=1')
+        ro_conn.execute('PRAGMA temp_store=MEMORY')
+        ro_conn.execute('PRAGMA cache_size=-64000')
+        return ro_conn
     
     def _create_tables(self) -> None:
         """Create the database tables."""
@@ -80,7 +148,8 @@ class ImageStorage:
         return hash_sha256.hexdigest()
     
     def store_image(self, metadata: ImageMetadata, image_data: bytes, 
-                    delete_original: bool = False) -> bool:
+                    delete_original: bool = False, commit: bool = True,
+                    file_hash: Optional[str] = None) -> bool:
         """
         Store an image in the database.
         
@@ -88,6 +157,10 @@ class ImageStorage:
             metadata: ImageMetadata object
             image_data: Raw image bytes
             delete_original: If True, delete the original file after storing
+            commit: If False, leave the insert in the open transaction so a
+                batch of stores can be committed together with commit().
+                The row is always committed before an original is deleted.
+            file_hash: SHA256 hex digest of image_data, if already computed
             
         Returns:
             True if stored successfully
@@ -95,7 +168,9 @@ class ImageStorage:
         cursor = self.conn.cursor()
         
         try:
-            file_hash = self._compute_file_hash(metadata.file_path)
+            # The bytes are already in memory, so hash them rather than re-reading the file
+            if file_hash is None:
+                file_hash = hashlib.sha256(image_data).hexdigest()
             
             cursor.execute('''
                 INSERT OR REPLACE INTO stored_images (
@@ -124,16 +199,16 @@ class ImageStorage:
                 image_data
             ))
             
-            self.conn.commit()
+            self._stats_cache = None
+            if commit or delete_original:
+                self.conn.commit()
             
             # Delete original if requested
             if delete_original and os.path.exists(metadata.file_path):
                 os.remove(metadata.file_path)
-                cursor.execute('''
-                    UPDATE stored_images SET original_deleted = 1 
-                    WHERE original_path = ?
-                ''', (metadata.file_path,))
-                self.conn.commit()
+                cursor.execute(_SQL_MARK_DELETED_BY_PATH, (metadata.file_path,))
+                if commit:
+                    self.conn.commit()
             
             return True
             
@@ -142,7 +217,7 @@ class ImageStorage:
             return False
     
     def store_image_from_file(self, file_path: str, metadata: ImageMetadata = None,
-                              delete_original: bool = False) -> bool:
+                              delete_original: bool = False, commit: bool = True) -> bool:
         """
         Store an image from file path.
         
@@ -150,6 +225,7 @@ class ImageStorage:
             file_path: Path to image file
             metadata: Optional pre-parsed metadata
             delete_original: If True, delete the original file after storing
+            commit: If False, leave the write uncommitted (see store_image)
             
         Returns:
             True if stored successfully
@@ -164,15 +240,61 @@ class ImageStorage:
                 from .metadata_parser import MetadataParser
                 metadata = MetadataParser.parse_image(file_path)
             
-            return self.store_image(metadata, image_data, delete_original)
+            return self.store_image(metadata, image_data, delete_original, commit)
             
         except Exception as e:
             print(f"[ERROR] Failed to store image from file: {e}")
             return False
     
+    def is_stored_unchanged(self, file_path: str, file_hash: Optional[str] = None) -> bool:
+        """
+        Check whether a file is already stored with identical content.
+        
+        Files that are not stored yet are never hashed.
+        
+        Args:
+            file_path: Path to image file
+            file_hash: SHA256 hex digest of the file, if already computed
+            
+        Returns:
+            True if a row for this path exists and its hash matches the file
+        """
+        row = self.conn.execute(_SQL_SELECT_HASH_BY_PATH, (file_path,)).fetchone()
+        if row is None:
+            return False
+        if file_hash is not None:
+            return file_hash == row['file_hash']
+        try:
+            return self._compute_file_hash(file_path) == row['file_hash']
+        except OSError:
+            return False
+    
+    def commit(self) -> None:
+        """Commit writes left open by store_image(commit=False)."""
+        self.conn.commit()
+    
+    @contextmanager
+    def read_conn(self):
+        """
+        Check out a read-only connection from the pool, opening it on first use.
+        
+        Usable from any thread. Reads see committed data only, so writes
+        left open with commit=False are not visible until commit().
+        For an in-memory database this is the writer connection itself,
+        bound to the creating thread.
+        """
+        if self._in_memory:
+            yield self.conn
+            return
+        conn = self._checkout_read_conn()
+        try:
+            yield conn
+        finally:
+            self._ro_pool.put(conn)
+    
     def get_image_data(self, original_path: str) -> Optional[bytes]:
         """
-        Get image data by original path.
+        Get image data by original path. Safe to call from any thread.
         
         Args:
             original_path: Original file path
@@ -180,12 +302,8 @@ class ImageStorage:
         Returns:
             Image bytes or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            'SELECT image_data FROM stored_images WHERE original_path = ?',
-            (original_path,)
-        )
-        row = cursor.fetchone()
+        with self.read_conn() as conn:
+            row = conn.execute(_SQL_SELECT_IMAGE_DATA, (original_path,)).fetchone()
         
         if row:
             return row['image_data']
@@ -201,12 +319,11 @@ class ImageStorage:
         Returns:
             Tuple of (metadata, image_data) or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            'SELECT * FROM stored_images WHERE file_hash = ?',
-            (file_hash,)
-        )
-        row = cursor.fetchone()
+        with self.read_conn() as conn:
+            row = conn.execute(
+                'SELECT * FROM stored_images WHERE file_hash = ?',
+                (file_hash,)
+            ).fetchone()
         
         if row:
             metadata = self._row_to_metadata(row)
@@ -217,16 +334,9 @@ class ImageStorage:
         """Get metadata for all stored images."""
         print("[DEBUG] ImageStorage.get_all_metadata() called")
         try:
-            cursor = self.conn.cursor()
             # Don't fetch image_data as it can be very large
-            cursor.execute('''
-                SELECT id, original_path, file_name, file_hash, file_size,
-                       width, height, prompt, negative_prompt, model, model_hash,
-                       sampler, steps, cfg_scale, seed, source, raw_metadata,
-                       extra_params, stored_at, original_deleted
-                FROM stored_images ORDER BY stored_at DESC
-            ''')
-            rows = cursor.fetchall()
+            with self.read_conn() as conn:
+                rows = conn.execute(_SQL_SELECT_ALL_METADATA).fetchall()
             print(f"[DEBUG] Query returned {len(rows)} rows")
             result = [self._row_to_metadata(row) for row in rows]
             print(f"[DEBUG] get_all_metadata() returned {len(result)} images")
@@ -269,6 +379,87 @@ class ImageStorage:
             print(f"[ERROR] Failed to get image details: {e}")
             return None
 
+    def get_all_image_details(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get additional details for every stored image in one query.
+
+        Returns:
+            Dictionary mapping original path to a dict with stored_at,
+            original_deleted and file_size
+        """
+        try:
+            with self.read_conn() as conn:
+                cursor = conn.execute(
+                    'SELECT original_path, stored_at, original_deleted, file_size FROM stored_images'
+                )
+                return {
+                    row['original_path']: {
+                        'stored_at': row['stored_at'],
+                        'original_deleted': row['original_deleted'],
+                        'file_size': row['file_size']
+                    }
+                    for row in cursor
+                }
+        except Exception as e:
+            print(f"[ERROR] Failed to get image details: {e}")
+            return {}
+
+    def get_stored_rowids(self) -> List[int]:
+        """
+        Get the rowid of every stored image, newest first.
+        
+        Returns:
+            List of rowids in the same order as get_all_metadata()
+        """
+        try:
+            with self.read_conn() as conn:
+                rows = conn.execute(_SQL_SELECT_ROWIDS).fetchall()
+            return [row[0] for row in rows]
+        except Exception as e:
+            print(f"[ERROR] Failed to list stored rowids: {e}")
+            return []
+
+    def get_table_rows(self, rowids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the columns shown in the stored images table for some rows.
+        
+        Args:
+            rowids: Rowids to fetch
+            
+        Returns:
+            Dictionary mapping rowid to a dict with original_path, file_name,
+            width, height, file_size, stored_at and original_deleted
+        """
+        if not rowids:
+            return {}
+        placeholders = ','.join('?' * len(rowids))
+        try:
+            with self.read_conn() as conn:
+                cursor = conn.execute(f'''
+                    SELECT rowid AS rowid, original_path, file_name, width, height,
+                           file_size, stored_at, original_deleted
+                    FROM stored_images WHERE rowid IN ({placeholders})
+                ''', rowids)
+                return {row['rowid']: dict(row) for row in cursor}
+        except Exception as e:
+            print(f"[ERROR] Failed to get table rows: {e}")
+            return {}
+
+    def get_table_fingerprint(self) -> Tuple[int, int, int, int]:
+        """
+        Get a cheap fingerprint of the stored_images table.
+        
+        Any insert, replace or delete changes the row count or the highest
+        rowid; deleted-original flags and sizes are folded in as well. Comes
+        from the same cached scan as get_storage_stats().
+        
+        Returns:
+            Tuple of (row count, max rowid, total file size, deleted originals)
+        """
+        totals = self._table_totals()
+        return (totals['total_images'], totals['max_rowid'],
+                totals['original_size'], totals['deleted_originals'])
+
     def delete_image(self, original_path: str, delete_data: bool = True) -> bool:
         """
         Delete an image from storage.
@@ -283,24 +474,39 @@ class ImageStorage:
         cursor = self.conn.cursor()
         
         try:
-            if delete_data:
-                cursor.execute(
-                    'DELETE FROM stored_images WHERE original_path = ?',
-                    (original_path,)
-                )
-            else:
-                cursor.execute('''
-                    UPDATE stored_images SET original_deleted = 1 
-                    WHERE original_path = ?
-                ''', (original_path,))
+            sql = _SQL_DELETE_BY_PATH if delete_data else _SQL_MARK_DELETED_BY_PATH
+            cursor.execute(sql, (original_path,))
             
             self.conn.commit()
+            self._stats_cache = None
             return cursor.rowcount > 0
             
         except Exception as e:
             print(f"[ERROR] Failed to delete image: {e}")
             return False
     
+    def delete_images(self, original_paths: List[str], delete_data: bool = True) -> int:
+        """
+        Delete several images from storage in a single transaction.
+        
+        Args:
+            original_paths: Original file paths
+            delete_data: If True, delete the image data. If False, just mark as deleted.
+            
+        Returns:
+            Number of rows deleted or marked
+        """
+        sql = _SQL_DELETE_BY_PATH if delete_data else _SQL_MARK_DELETED_BY_PATH
+        
+        try:
+            with self.conn:
+                cursor = self.conn.executemany(sql, [(path,) for path in original_paths])
+            self._stats_cache = None
+            return cursor.rowcount
+        except Exception as e:
+            print(f"[ERROR] Failed to delete images: {e}")
+            return 0
+    
     def export_image(self, original_path: str, destination: str) -> bool:
         """
         Export an image from storage to a file.
@@ -325,59 +531,101 @@ class ImageStorage:
             print(f"[ERROR] Failed to export image: {e}")
             return False
     
-    def cleanup_deleted_originals(self, dry_run: bool = True) -> List[str]:
+    def cleanup_deleted_originals(self, dry_run: bool = True,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None) -> List[str]:
         """
         Find and optionally remove entries where original file no longer exists.
         
+        Paths are grouped by directory and each directory is listed once,
+        instead of stat'ing every stored path.
+        
         Args:
             dry_run: If True, only report what would be deleted
+            progress_callback: Optional callback(directories_done, directories_total)
             
         Returns:
             List of paths that were/would be cleaned up
         """
         cursor = self.conn.cursor()
-        cursor.execute('SELECT original_path FROM stored_images')
+        cursor.execute(_SQL_SELECT_PATHS)
         
-        to_cleanup = []
+        by_dir = defaultdict(list)
         for row in cursor.fetchall():
             path = row['original_path']
-            if not os.path.exists(path):
-                to_cleanup.append(path)
+            by_dir[os.path.dirname(path)].append(path)
         
-        if not dry_run:
-            for path in to_cleanup:
-                self.delete_image(path, delete_data=True)
+        to_cleanup = []
+        total_dirs = len(by_dir)
+        for done, (directory, paths) in enumerate(by_dir.items(), 1):
+            try:
+                present = set(os.listdir(directory or '.'))
+            except FileNotFoundError:
+                present = set()
+            except OSError:
+                present = None  # Unreadable - fall back to per-path checks
+            
+            for path in paths:
+                if present is not None and os.path.basename(path) in present:
+                    continue
+                # Confirm before reporting, so case-insensitive file systems
+                # and unlistable directories never flag an existing file
+                if not os.path.exists(path):
+                    to_cleanup.append(path)
+            
+            if progress_callback and (done % 100 == 0 or done == total_dirs):
+                progress_callback(done, total_dirs)
+        
+        if not dry_run and to_cleanup:
+            self.delete_images(to_cleanup, delete_data=True)
         
         return to_cleanup
     
-    def get_storage_stats(self) -> Dict[str, Any]:
-        """Get storage statistics."""
+    def _table_totals(self) -> Dict[str, int]:
+        """
+        Aggregate the stored_images table in a single scan.
+        
+        The result is cached until this instance writes or another
+        connection (such as an import worker) commits a change, which
+        SQLite reports through PRAGMA data_version.
+        """
         cursor = self.conn.cursor()
+        data_version = cursor.execute('PRAGMA data_version').fetchone()[0]
+        if self._stats_cache is not None and data_version == self._stats_version:
+            return self._stats_cache
         
-        # Total count and size
         cursor.execute('''
-            SELECT COUNT(*), SUM(file_size), SUM(LENGTH(image_data)) 
+            SELECT COUNT(*), COALESCE(SUM(file_size), 0), COALESCE(SUM(LENGTH(image_data)), 0),
+                   COALESCE(SUM(original_deleted), 0), COALESCE(MAX(rowid), 0)
             FROM stored_images
         ''')
         row = cursor.fetchone()
-        total_count = row[0] or 0
-        total_original_size = row[1] or 0
-        total_storage_size = row[2] or 0
+        self._stats_cache = {
+            'total_images': row[0],
+            'original_size': row[1],
+            'storage_size': row[2],
+            'deleted_originals': row[3],
+            'max_rowid': row[4]
+        }
+        self._stats_version = data_version
+        return self._stats_cache
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
         
-        # Count of deleted originals
-        cursor.execute('''
-            SELECT COUNT(*) FROM stored_images WHERE original_deleted = 1
-        ''')
-        deleted_count = cursor.fetchone()[0] or 0
+        Table totals come from the cached scan in _table_totals(); only the
+        database file size is read fresh.
+        """
+        totals = self._table_totals()
         
         # Database file size
         db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
         
         return {
-            'total_images': total_count,
-            'deleted_originals': deleted_count,
-            'original_size_mb': total_original_size / (1024 * 1024),
-            'storage_size_mb': total_storage_size / (1024 * 1024),
+            'total_images': totals['total_images'],
+            'deleted_originals': totals['deleted_originals'],
+            'original_size_mb': totals['original_size'] / (1024 * 1024),
+            'storage_size_mb': totals['storage_size'] / (1024 * 1024),
             'database_size_mb': db_size / (1024 * 1024)
         }
     
@@ -427,6 +675,7 @@ class ImageStorage:
             cursor = self.conn.cursor()
             cursor.execute('DELETE FROM stored_images')
             self.conn.commit()
+            self._stats_cache = None
             print(f"[DEBUG] Cleared SQLite image storage ({cursor.rowcount} images removed)")
             return True
         except Exception as e:
@@ -434,7 +683,9 @@ class ImageStorage:
             return False
     
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
+        while not self._ro_pool.empty():
+            self._ro_pool.get_nowait().close()
         self.conn.close()
     
     def __enter__(self):
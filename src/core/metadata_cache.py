@@ -7,6 +7,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from ..models.image_data import ImageMetadata
+from .image_scanner import ImageScanner
 
 
 class MetadataCache:
@@ -31,6 +32,7 @@ class MetadataCache:
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._signatures: Dict[str, Optional[str]] = {}  # Stored signatures seen by load_cache
     
     def _get_folder_hash(self, folder_path: str) -> str:
         """Generate a hash for the folder path."""
@@ -65,6 +67,7 @@ class MetadataCache:
             List of ImageMetadata if cache is valid, None otherwise
         """
         cache_file = self._get_cache_file(folder_path)
+        self._signatures.pop(folder_path, None)
         
         if not cache_file.exists():
             print(f"[DEBUG] No cache file found for {folder_path}")
@@ -84,6 +87,10 @@ class MetadataCache:
                 print(f"[DEBUG] Cache folder path mismatch, rebuilding")
                 return None
             
+            # Kept even if validation fails below, so a rescan that reproduces
+            # the cached contents can skip rewriting them
+            self._signatures[folder_path] = cache_data.get('signature')
+            
             # Verify all files are still valid (unless skipped)
             cached_files = cache_data.get('files', {})
             
@@ -118,9 +125,42 @@ class MetadataCache:
             return metadata_list
             
         except Exception as e:
+            # An unreadable cache must be rewritten, whatever its signature
+            self._signatures.pop(folder_path, None)
             print(f"[ERROR] Failed to load cache: {e}")
             return None
     
+    @staticmethod
+    def compute_signature(metadata_list: List[ImageMetadata]) -> str:
+        """
+        Compute a signature of a scan result from its paths and modification times.
+        
+        Args:
+            metadata_list: Scanned images
+            
+        Returns:
+            Hex digest that changes when any file is added, removed, or modified
+        """
+        hasher = hashlib.sha256()
+        for path, mtime in sorted((m.file_path, m.modified_time) for m in metadata_list):
+            hasher.update(f"{path}:{mtime}\n".encode())
+        return hasher.hexdigest()[:16]
+    
+    def get_signature(self, folder_path: str) -> Optional[str]:
+        """
+        Get the signature stored with a folder's cache.
+        
+        Known once load_cache has read the folder's cache file, even if the
+        files on disk no longer match it, or save_cache has written it.
+        
+        Args:
+            folder_path: Path to the image folder
+            
+        Returns:
+            Stored signature, or None if unknown
+        """
+        return self._signatures.get(folder_path)
+    
     def save_cache(self, folder_path: str, metadata_list: List[ImageMetadata]) -> bool:
         """
         Save metadata to cache file.
@@ -149,12 +189,14 @@ class MetadataCache:
                 'folder_path': folder_path,
                 'cached_at': datetime.now().isoformat(),
                 'file_count': len(metadata_list),
+                'signature': self.compute_signature(metadata_list),
                 'files': files_cache
             }
             
             with open(cache_file, 'w', encoding='utf-8') as f:
                 json.dump(cache_data, f, indent=2)
             
+            self._signatures[folder_path] = cache_data['signature']
             print(f"[DEBUG] Saved cache with {len(metadata_list)} images")
             return True
             
@@ -200,16 +242,18 @@ class MetadataCache:
             Dict mapping file paths to file hashes
         """
         files = {}
-        folder = Path(folder_path)
+        folder = Path(folder_path).absolute()
         
         if not folder.exists():
             return files
         
-        for ext in ['*.png', '*.jpg', '*.jpeg']:
-            for file_path in folder.rglob(ext):
-                if file_path.is_file():
-                    file_hash = self._compute_file_hash(str(file_path))
-                    files[str(file_path)] = file_hash
+        # Same file set the scanner caches, or every folder holding e.g. a
+        # .webp would fail validation on each load
+        extensions = ImageScanner.SUPPORTED_EXTENSIONS
+        for file_path in folder.rglob('*'):
+            if file_path.suffix.lower() in extensions and file_path.is_file():
+                file_hash = self._compute_file_hash(str(file_path))
+                files[str(file_path)] = file_hash
         
         return files
     
@@ -4,11 +4,12 @@ from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import hashlib
 import io
+import json
 
 try:
     import psycopg2
     from psycopg2 import sql
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import RealDictCursor, execute_values
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
@@ -134,9 +135,6 @@ class PostgresImageStorage:
                 return None
         
         try:
-            # Create Large Object using psycopg2.extras
-            from psycopg2 import extras
-            
             # Create a new large object
             lo = self.conn.lobject(0, 'wb')
             lo_oid = lo.oid
@@ -151,7 +149,6 @@ class PostgresImageStorage:
             
             # Insert metadata
             with self.conn.cursor() as cur:
-                import json
                 cur.execute('''
                     INSERT INTO stored_images (
                         original_path, file_name, content_hash, file_size, width, height,
@@ -191,6 +188,96 @@ class PostgresImageStorage:
             print(f"[ERROR] Failed to store image: {e}")
             return None
     
+    def store_batch(self, items: List[Tuple[ImageMetadata, bytes, str]]) -> Optional[Dict[str, int]]:
+        """
+        Store several images in one transaction with a single multi-row INSERT.
+        
+        Images whose content is already stored, or whose path is already
+        stored, are skipped just as store_image() would reject them.
+        
+        Args:
+            items: (metadata, image bytes, SHA256 hex digest of the bytes) triples
+            
+        Returns:
+            Dictionary mapping original path to new image ID for every stored
+            image, or None if the batch could not be stored
+        """
+        if not items:
+            return {}
+        if not self.is_connected():
+            return None
+        
+        try:
+            with self.conn.cursor() as cur:
+                # Drop content that is already stored or repeated within the batch
+                cur.execute(
+                    "SELECT content_hash FROM stored_images WHERE content_hash = ANY(%s)",
+                    ([content_hash for _, _, content_hash in items],)
+                )
+                seen = {row[0] for row in cur.fetchall()}
+                
+                rows = []
+                for metadata, image_data, content_hash in items:
+                    if content_hash in seen:
+                        continue
+                    seen.add(content_hash)
+                    
+                    lo = self.conn.lobject(0, 'wb')
+                    chunk_size = 1024 * 1024  # 1MB chunks
+                    for i in range(0, len(image_data), chunk_size):
+                        lo.write(image_data[i:i + chunk_size])
+                    lo.close()
+                    
+                    rows.append((
+                        metadata.file_path,
+                        metadata.file_name,
+                        content_hash,
+                        len(image_data),
+                        metadata.width,
+                        metadata.height,
+                        metadata.prompt,
+                        metadata.negative_prompt,
+                        metadata.model,
+                        metadata.model_hash,
+                        metadata.sampler,
+                        metadata.steps,
+                        metadata.cfg_scale,
+                        metadata.seed,
+                        metadata.source,
+                        metadata.raw_metadata,
+                        json.dumps(metadata.extra_params),
+                        lo.oid
+                    ))
+                
+                if not rows:
+                    self.conn.commit()
+                    return {}
+                
+                inserted = execute_values(cur, '''
+                    INSERT INTO stored_images (
+                        original_path, file_name, content_hash, file_size, width, height,
+                        prompt, negative_prompt, model, model_hash, sampler, steps,
+                        cfg_scale, seed, source, raw_metadata, extra_params, lo_oid
+                    ) VALUES %s
+                    ON CONFLICT DO NOTHING
+                    RETURNING id, original_path, lo_oid
+                ''', rows, page_size=len(rows), fetch=True)
+                
+                # Rows skipped on a path conflict leave their Large Objects unused
+                used = {row[2] for row in inserted}
+                unused = [row[-1] for row in rows if row[-1] not in used]
+                if unused:
+                    cur.execute("SELECT lo_unlink(oid) FROM unnest(%s::oid[]) AS oid", (unused,))
+                
+                self.conn.commit()
+                print(f"[DEBUG] Stored batch of {len(inserted)} images")
+                return {row[1]: row[0] for row in inserted}
+                
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[ERROR] Failed to store image batch: {e}")
+            return None
+    
     def store_image_from_file(self, file_path: str, metadata: ImageMetadata = None) -> Optional[int]:
         """Store an image from file path."""
         try:
@@ -293,6 +380,40 @@ class PostgresImageStorage:
             print(f"[ERROR] Failed to get metadata: {e}")
             return None
     
+    def get_table_page(self, after: Optional[Tuple[Any, int]] = None,
+                       limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get one page of the columns shown in the stored images table, newest first.
+        
+        Pages are keyed on (stored_at, id) rather than OFFSET, so every page
+        costs the same regardless of how far into the table it is.
+        
+        Args:
+            after: (stored_at, id) of the last row of the previous page, or None
+            limit: Maximum number of rows
+            
+        Returns:
+            List of dicts with id, original_path, file_name, width, height,
+            file_size and stored_at
+        """
+        if not self.is_connected():
+            return []
+        
+        columns = "SELECT id, original_path, file_name, width, height, file_size, stored_at FROM stored_images"
+        order = "ORDER BY stored_at DESC, id DESC LIMIT %s"
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if after is None:
+                    cur.execute(f"{columns} {order}", (limit,))
+                else:
+                    cur.execute(f"{columns} WHERE (stored_at, id) < (%s, %s) {order}", (*after, limit))
+                return [dict(row) for row in cur.fetchall()]
+                
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[ERROR] Failed to list images: {e}")
+            return []
+    
     def get_all_metadata(self) -> List[ImageMetadata]:
         """Get metadata for all stored images."""
         if not self.is_connected():
@@ -304,9 +425,48 @@ class PostgresImageStorage:
                 return [self._row_to_metadata(row) for row in cur.fetchall()]
                 
         except Exception as e:
+            self.conn.rollback()
             print(f"[ERROR] Failed to list images: {e}")
             return []
     
+    def delete_images(self, image_ids: List[int]) -> int:
+        """
+        Delete several images and their Large Objects in a single transaction.
+        
+        Args:
+            image_ids: Image IDs to delete
+            
+        Returns:
+            Number of images deleted
+        """
+        if not image_ids or not self.is_connected():
+            return 0
+        
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM stored_images WHERE id = ANY(%s) RETURNING lo_oid",
+                    (list(image_ids),)
+                )
+                oids = [row[0] for row in cur.fetchall()]
+                deleted = len(oids)
+                
+                # Unlink the Large Objects server-side in the same transaction
+                oids = [oid for oid in oids if oid]
+                if oids:
+                    cur.execute(
+                        "SELECT lo_unlink(oid) FROM unnest(%s::oid[]) AS oid",
+                        (oids,)
+                    )
+                
+                self.conn.commit()
+                return deleted
+                
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[ERROR] Failed to delete images: {e}")
+            return 0
+    
     def delete_image(self, image_id: int) -> bool:
         """
         Delete an image from storage.
@@ -370,18 +530,13 @@ class PostgresImageStorage:
         
         try:
             with self.conn.cursor() as cur:
-                # Count and total size
+                # Count, total size and database size in one round-trip
                 cur.execute('''
-                    SELECT COUNT(*), SUM(file_size) 
+                    SELECT COUNT(*), SUM(file_size),
+                           pg_size_pretty(pg_database_size(current_database()))
                     FROM stored_images
                 ''')
-                count, total_size = cur.fetchone()
-                
-                # Database size
-                cur.execute('''
-                    SELECT pg_size_pretty(pg_database_size(current_database()))
-                ''')
-                db_size = cur.fetchone()[0]
+                count, total_size, db_size = cur.fetchone()
                 
                 return {
                     'connected': True,
@@ -396,7 +551,6 @@ class PostgresImageStorage:
     
     def _row_to_metadata(self, row: Dict) -> ImageMetadata:
         """Convert database row to ImageMetadata."""
-        import json
         return ImageMetadata(
             file_path=row['original_path'],
             file_name=row['file_name'],
@@ -2,6 +2,7 @@
 import sys
 import os
 import argparse
+import logging
 
 # Add src to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -195,6 +196,9 @@ def main():
     # Parse command-line arguments
     args = parse_args()
     
+    # Modules log through logging; show warnings and errors by default
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(name)s: %(message)s")
+    
     # Handle --reset flag before creating the main application
     if args.reset:
         if not clear_all_caches(args.no_confirm):
@@ -51,26 +51,21 @@ class ImageMetadata:
         """
         Check if image matches filter criteria.
         
+        Terms must already be lowercase, as FilterBar's parsed terms are,
+        so only the prompt is lowered per image.
+        
         Args:
-            include_terms: List of terms that must be in prompt (positive filter)
-            exclude_terms: List of terms that must NOT be in prompt (negative filter)
+            include_terms: Lowercase terms that must be in prompt (positive filter)
+            exclude_terms: Lowercase terms that must NOT be in prompt (negative filter)
         
         Returns:
             True if image matches all criteria
         """
         prompt_lower = self.prompt.lower()
         
-        # Check include terms (all must match)
-        for term in include_terms:
-            if term.lower() not in prompt_lower:
-                return False
-        
-        # Check exclude terms (none must match)
-        for term in exclude_terms:
-            if term.lower() in prompt_lower:
-                return False
-        
-        return True
+        # all()/any() short-circuit on the first failing term
+        return (all(term in prompt_lower for term in include_terms)
+                and not any(term in prompt_lower for term in exclude_terms))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
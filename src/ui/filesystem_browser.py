@@ -1,12 +1,102 @@
 """Filesystem browser widget for navigating directories and files."""
 import os
+import stat
 from pathlib import Path
+from typing import Dict, List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeView,
-    QLineEdit, QPushButton, QHBoxLayout, QLabel, QCheckBox
+    QLineEdit, QPushButton, QHBoxLayout, QLabel, QCheckBox, QApplication, QStyle
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDir, QModelIndex
-from PyQt6.QtGui import QFileSystemModel, QIcon
+from PyQt6.QtCore import Qt, pyqtSignal, QDir, QModelIndex, QFileInfo, QSettings
+from PyQt6.QtGui import QFileSystemModel, QIcon, QAbstractFileIconProvider
+
+
+_BROWSER_QSS = """
+    QPushButton#navBtn, QPushButton#goBtn {
+        background-color: #3a3a3a;
+        color: white;
+        border: 1px solid #555;
+        padding: 5px;
+        border-radius: 4px;
+    }
+    QPushButton#navBtn {
+        font-size: 16px;
+    }
+    QPushButton#navBtn:hover, QPushButton#goBtn:hover {
+        background-color: #4a4a4a;
+    }
+    QCheckBox#subfoldersCheckbox {
+        color: #eee;
+        spacing: 5px;
+    }
+    QCheckBox#subfoldersCheckbox::indicator {
+        width: 18px;
+        height: 18px;
+        background-color: #2a2a2a;
+        border: 1px solid #444;
+        border-radius: 3px;
+    }
+    QCheckBox#subfoldersCheckbox::indicator:checked {
+        background-color: #4a9eff;
+    }
+    QPushButton#loadBtn {
+        background-color: #4a9eff;
+        color: white;
+        border: none;
+        padding: 5px 15px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton#loadBtn:hover {
+        background-color: #5aa9ff;
+    }
+    QPushButton#loadBtn:pressed {
+        background-color: #3a8eef;
+    }
+    QTreeView {
+        background-color: #1a1a1a;
+        color: #eee;
+        border: 1px solid #333;
+        selection-background-color: #4a9eff;
+    }
+    QTreeView::item:hover {
+        background-color: #2a2a2a;
+    }
+    QLineEdit {
+        background-color: #2a2a2a;
+        color: #eee;
+        border: 1px solid #444;
+        border-radius: 4px;
+        padding: 5px;
+    }
+"""
+
+
+def _classify(path: str) -> Optional[str]:
+    """Return 'dir', 'file', or None if the path does not exist (one stat call)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return 'dir' if stat.S_ISDIR(st.st_mode) else 'file'
+
+
+class FastIconProvider(QAbstractFileIconProvider):
+    """Icon provider that hands out two shared icons instead of probing each file."""
+    
+    def __init__(self):
+        super().__init__()
+        style = QApplication.style()
+        self._folder_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+    
+    def icon(self, info):
+        """Return the folder icon for directories and the file icon otherwise."""
+        if isinstance(info, QFileInfo):
+            return self._folder_icon if info.isDir() else self._file_icon
+        if info == QAbstractFileIconProvider.IconType.Folder:
+            return self._folder_icon
+        return self._file_icon
 
 
 class FilesystemBrowser(QWidget):
@@ -17,10 +107,18 @@ class FilesystemBrowser(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._classify_cache: Dict[str, Optional[str]] = {}
+        self.settings = QSettings("SDImageViewer", "Settings")
+        # Expanded dirs saved on hide; save_expanded_paths persists them
+        self._expanded_snapshot: List[str] = self.settings.value(
+            "browser_expanded_paths", [], type=list)
         self._setup_ui()
         
     def _setup_ui(self):
         """Set up the UI components."""
+        # Style - one sheet for all children, object names select per widget
+        self.setStyleSheet(_BROWSER_QSS)
+        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(5)
@@ -31,42 +129,18 @@ class FilesystemBrowser(QWidget):
         
         # Home button
         self.home_btn = QPushButton("🏠")
+        self.home_btn.setObjectName("navBtn")
         self.home_btn.setToolTip("Go to home directory")
         self.home_btn.setFixedWidth(40)
         self.home_btn.clicked.connect(self._go_home)
-        self.home_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: white;
-                border: 1px solid #555;
-                padding: 5px;
-                border-radius: 4px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         nav_layout.addWidget(self.home_btn)
         
         # Up directory button
         self.up_btn = QPushButton("⬆")
+        self.up_btn.setObjectName("navBtn")
         self.up_btn.setToolTip("Go up one directory")
         self.up_btn.setFixedWidth(40)
         self.up_btn.clicked.connect(self._go_up)
-        self.up_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: white;
-                border: 1px solid #555;
-                padding: 5px;
-                border-radius: 4px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         nav_layout.addWidget(self.up_btn)
         
         # Path input
@@ -77,20 +151,9 @@ class FilesystemBrowser(QWidget):
         
         # Go button
         self.go_btn = QPushButton("Go")
+        self.go_btn.setObjectName("goBtn")
         self.go_btn.clicked.connect(self._navigate_to_path)
         self.go_btn.setFixedWidth(50)
-        self.go_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: white;
-                border: 1px solid #555;
-                padding: 5px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         nav_layout.addWidget(self.go_btn)
         
         layout.addLayout(nav_layout)
@@ -100,46 +163,16 @@ class FilesystemBrowser(QWidget):
         toggle_layout.setSpacing(5)
         
         self.include_subfolders_checkbox = QCheckBox("Include subfolders")
+        self.include_subfolders_checkbox.setObjectName("subfoldersCheckbox")
         self.include_subfolders_checkbox.setChecked(True)
         self.include_subfolders_checkbox.setToolTip("When checked, loads images from all subdirectories")
-        self.include_subfolders_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #eee;
-                spacing: 5px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4a9eff;
-            }
-        """)
         toggle_layout.addWidget(self.include_subfolders_checkbox)
         
         # Load button
         self.load_btn = QPushButton("📂 Load Folder")
+        self.load_btn.setObjectName("loadBtn")
         self.load_btn.setToolTip("Load images from the currently selected folder")
         self.load_btn.clicked.connect(self._load_current_folder)
-        self.load_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4a9eff;
-                color: white;
-                border: none;
-                padding: 5px 15px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #5aa9ff;
-            }
-            QPushButton:pressed {
-                background-color: #3a8eef;
-            }
-        """)
         toggle_layout.addWidget(self.load_btn)
         
         toggle_layout.addStretch()
@@ -147,15 +180,21 @@ class FilesystemBrowser(QWidget):
         
         # File system model and tree view
         self.model = QFileSystemModel()
-        self.model.setRootPath("")
         self.model.setFilter(QDir.Filter.AllDirs | QDir.Filter.Files | QDir.Filter.NoDotAndDotDot)
         
-        # Set name filters for image files
+        # Set name filters for image files. Matching is case-insensitive
+        # because the filter does not include QDir.Filter.CaseSensitive,
+        # so uppercase variants would only add redundant pattern checks.
         self.model.setNameFilters([
-            "*.png", "*.jpg", "*.jpeg", "*.webp", "*.avif", "*.jxl",
-            "*.PNG", "*.JPG", "*.JPEG", "*.WEBP", "*.AVIF", "*.JXL"
+            "*.png", "*.jpg", "*.jpeg", "*.webp", "*.avif", "*.jxl"
         ])
         self.model.setNameFilterDisables(False)  # Hide non-matching files
+        self.model.directoryLoaded.connect(self._clear_classify_cache)
+        
+        # Only names are shown, so skip the per-row MIME lookups of the
+        # platform icon provider. The model does not take ownership.
+        self._icon_provider = FastIconProvider()
+        self.model.setIconProvider(self._icon_provider)
         
         self.tree_view = QTreeView()
         self.tree_view.setModel(self.model)
@@ -184,34 +223,83 @@ class FilesystemBrowser(QWidget):
         # Set initial path to home directory
         home_path = str(Path.home())
         self.set_root_path(home_path)
-        
-        # Style
-        self.setStyleSheet("""
-            QTreeView {
-                background-color: #1a1a1a;
-                color: #eee;
-                border: 1px solid #333;
-                selection-background-color: #4a9eff;
-            }
-            QTreeView::item:hover {
-                background-color: #2a2a2a;
-            }
-            QLineEdit {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 5px;
-            }
-        """)
+    
+    def _classify_path(self, path: str) -> Optional[str]:
+        """Classify a path, reusing the result until the directory changes."""
+        if path not in self._classify_cache:
+            self._classify_cache[path] = _classify(path)
+        return self._classify_cache[path]
+    
+    def _clear_classify_cache(self, *args):
+        """Drop cached path classifications after a directory change."""
+        self._classify_cache.clear()
     
     def set_root_path(self, path: str):
         """Set the root path for the tree view."""
-        if os.path.exists(path):
-            index = self.model.index(path)
-            self.tree_view.setRootIndex(index)
+        self._clear_classify_cache()
+        if self._classify_path(path) is not None:
+            # Move the model's watch root too, so its file system watcher
+            # only covers the displayed subtree. Repaints are frozen while
+            # the root switches so the view redraws once, not per row.
+            self.tree_view.setUpdatesEnabled(False)
+            self.tree_view.viewport().setUpdatesEnabled(False)
+            try:
+                index = self.model.setRootPath(path)
+                self.tree_view.setRootIndex(index)
+            finally:
+                self.tree_view.viewport().setUpdatesEnabled(True)
+                self.tree_view.setUpdatesEnabled(True)
             self.path_input.setText(path)
     
+    def expand_paths(self, paths: List[str]):
+        """
+        Expand the given directories in one batch.
+
+        Repaints and per-row expanded signals are suspended while the rows
+        are expanded, so restoring many nodes costs a single relayout.
+
+        Args:
+            paths: Directory paths to expand
+        """
+        self.tree_view.setUpdatesEnabled(False)
+        self.tree_view.blockSignals(True)
+        try:
+            for path in paths:
+                index = self.model.index(path)
+                if index.isValid():
+                    self.tree_view.setExpanded(index, True)
+        finally:
+            self.tree_view.blockSignals(False)
+            self.tree_view.setUpdatesEnabled(True)
+
+    def _iter_expanded(self):
+        """Yield expanded indexes, descending only into expanded subtrees."""
+        pending = [self.tree_view.rootIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(self.model.rowCount(parent)):
+                index = self.model.index(row, 0, parent)
+                if self.tree_view.isExpanded(index):
+                    yield index
+                    pending.append(index)
+    
+    def hideEvent(self, event):
+        """Remember which directories were expanded."""
+        self._expanded_snapshot = [self.model.filePath(i) for i in self._iter_expanded()]
+        super().hideEvent(event)
+    
+    def save_expanded_paths(self):
+        """Persist the expanded directories for the next session; call once at shutdown."""
+        if self.isVisible():
+            self._expanded_snapshot = [self.model.filePath(i) for i in self._iter_expanded()]
+        self.settings.setValue("browser_expanded_paths", self._expanded_snapshot)
+    
+    def showEvent(self, event):
+        """Restore the expanded directories saved on hide in one batch."""
+        super().showEvent(event)
+        if self._expanded_snapshot:
+            self.expand_paths(self._expanded_snapshot)
+    
     def _go_home(self):
         """Navigate to home directory."""
         home_path = str(Path.home())
@@ -228,7 +316,7 @@ class FilesystemBrowser(QWidget):
     def _navigate_to_path(self):
         """Navigate to the path entered in the input."""
         path = self.path_input.text().strip()
-        if path and os.path.exists(path):
+        if path and self._classify_path(path) is not None:
             self.set_root_path(path)
         else:
             self.info_label.setText("Invalid path")
@@ -237,15 +325,16 @@ class FilesystemBrowser(QWidget):
     def _on_item_clicked(self, index: QModelIndex):
         """Handle single click on item."""
         file_path = self.model.filePath(index)
+        kind = self._classify_path(file_path)
         
-        if os.path.isdir(file_path):
+        if kind == 'dir':
             # Update path input
             self.path_input.setText(file_path)
             # Just update the path, don't emit folder_selected yet
             # User needs to click "Load Folder" button
             self.info_label.setText(f"Selected: {os.path.basename(file_path)} (click Load Folder to view)")
             self.info_label.setStyleSheet("color: #4a9eff; font-size: 10px;")
-        elif os.path.isfile(file_path):
+        elif kind == 'file':
             # Emit file selected signal
             self.file_selected.emit(file_path)
             self.info_label.setText(f"Selected: {os.path.basename(file_path)}")
@@ -254,7 +343,7 @@ class FilesystemBrowser(QWidget):
     def _load_current_folder(self):
         """Load the currently selected folder."""
         folder_path = self.path_input.text().strip()
-        if folder_path and os.path.isdir(folder_path):
+        if folder_path and self._classify_path(folder_path) == 'dir':
             include_subfolders = self.include_subfolders_checkbox.isChecked()
             self.folder_selected.emit(folder_path, include_subfolders)
             self.info_label.setText(f"Loading: {os.path.basename(folder_path)} {'(with subfolders)' if include_subfolders else '(current folder only)'}")
@@ -264,7 +353,7 @@ class FilesystemBrowser(QWidget):
         """Handle double click on item."""
         file_path = self.model.filePath(index)
         
-        if os.path.isdir(file_path):
+        if self._classify_path(file_path) == 'dir':
             # Navigate into directory
             self.set_root_path(file_path)
             # Also emit folder selected with current subfolder setting
@@ -1,18 +1,152 @@
 """Filter bar for prompt-based filtering."""
-from typing import List, Callable, Optional
-import shlex
+import re
+from collections import namedtuple
+from functools import partial
+from typing import List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QLineEdit, QPushButton, QLabel,
-    QToolButton, QMenu, QApplication, QComboBox, QCheckBox
+    QToolButton, QComboBox, QCheckBox, QMessageBox
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QAction, QIcon
+
+
+# Snapshot of the filter criteria carried by FilterBar.filter_changed.
+# Terms are lowercased tuples; the orientation fields are booleans.
+FilterState = namedtuple('FilterState', 'include exclude portrait landscape square')
+
+# One filter term: quoted segments (commas allowed inside) and any
+# unquoted non-comma characters, up to the next unquoted comma
+_TERM_RE = re.compile(r'(?:"[^"]*"?|[^,"])+')
+
+# One stylesheet for the whole bar, parsed once at import; object names
+# select the per-widget rules
+_FILTER_BAR_QSS = """
+    FilterBar {
+        background-color: #1e1e1e;
+        border-bottom: 1px solid #333;
+    }
+    QLabel {
+        color: #eee;
+    }
+    QLabel#resultsLabel {
+        color: #888;
+    }
+    QLineEdit#includeInput, QLineEdit#excludeInput {
+        background-color: #2a2a2a;
+        color: #eee;
+        border: 1px solid #444;
+        border-radius: 4px;
+        padding: 5px;
+    }
+    QLineEdit#includeInput:focus {
+        border: 1px solid #4a9eff;
+    }
+    QLineEdit#excludeInput:focus {
+        border: 1px solid #ff6b6b;
+    }
+    QPushButton#searchBtn {
+        background-color: #4a9eff;
+        color: #fff;
+        border: none;
+        padding: 5px 15px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton#searchBtn:hover {
+        background-color: #5aa9ff;
+    }
+    QPushButton#searchBtn:pressed {
+        background-color: #3a8eef;
+    }
+    QPushButton#clearBtn {
+        background-color: #3a3a3a;
+        color: #eee;
+        border: 1px solid #555;
+        padding: 5px 15px;
+        border-radius: 4px;
+    }
+    QPushButton#clearBtn:hover {
+        background-color: #4a4a4a;
+    }
+    QToolButton#helpBtn {
+        background-color: #3a3a3a;
+        color: #eee;
+        border: 1px solid #555;
+        border-radius: 12px;
+        width: 24px;
+        height: 24px;
+    }
+    QToolButton#helpBtn:hover {
+        background-color: #4a4a4a;
+    }
+    QCheckBox#orientationCheckbox {
+        color: #eee;
+    }
+    QCheckBox#orientationCheckbox::indicator {
+        width: 16px;
+        height: 16px;
+        background-color: #2a2a2a;
+        border: 1px solid #444;
+        border-radius: 3px;
+    }
+    QCheckBox#orientationCheckbox::indicator:checked {
+        background-color: #4a9eff;
+    }
+"""
+
+# Sort controls are placed outside the bar, so they carry their own sheet
+_SORT_CONTROLS_QSS = """
+    QComboBox {
+        background-color: #2a2a2a;
+        color: #eee;
+        border: 1px solid #444;
+        padding: 5px;
+        border-radius: 4px;
+        min-width: 100px;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+    QComboBox QAbstractItemView {
+        background-color: #2a2a2a;
+        color: #eee;
+        selection-background-color: #4a9eff;
+    }
+    QCheckBox {
+        color: #eee;
+    }
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+        background-color: #2a2a2a;
+        border: 1px solid #444;
+        border-radius: 3px;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #4a9eff;
+    }
+"""
+
+_HELP_HTML = """
+<h3>Filter Help</h3>
+<p><b>Include:</b> Only show images whose prompt contains ALL of these terms.<br>
+Separate multiple terms with commas. Use quotes for phrases with commas.</p>
+<p><b>Exclude:</b> Hide images whose prompt contains ANY of these terms.<br>
+Separate multiple terms with commas. Use quotes for phrases with commas.</p>
+<p><b>Examples:</b></p>
+<ul>
+    <li>Include: <code>blue sky, clouds</code> → Shows images with both "blue sky" AND "clouds"</li>
+    <li>Include: <code>"blue sky", clouds</code> → Shows images with "blue sky" (as phrase) AND "clouds"</li>
+    <li>Exclude: <code>nsfw, blurry</code> → Hides images with "nsfw" OR "blurry"</li>
+</ul>
+<p>Filtering is case-insensitive. Press Enter or click Search to apply filters.</p>
+"""
 
 
 class FilterBar(QWidget):
     """Filter bar with include/exclude prompt filters and sorting options."""
     
-    filter_changed = pyqtSignal()  # Emitted when filter criteria change
+    filter_changed = pyqtSignal(object)  # Emits a FilterState when filter criteria change
     sort_changed = pyqtSignal()  # Emitted when sort criteria change
     
     # Sort options mapping - Date is default (newest first)
@@ -23,17 +157,29 @@ class FilterBar(QWidget):
         'File Size': 'file_size',
         'Random': 'random'
     }
+    _SORT_KEYS = tuple(SORT_OPTIONS.keys())
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self._debounce_timer = QTimer()
         self._debounce_timer.setSingleShot(True)
-        self._debounce_timer.timeout.connect(self._on_filter_changed)
+        self._debounce_timer.timeout.connect(self._emit_filter_changed)
+        self._last_norm = ("", "")  # Normalized (include, exclude) text last emitted
+        self._last_state = FilterState((), (), True, True, True)  # Last emitted criteria
+        self._inc_terms: Optional[List[str]] = None  # Parsed terms, None until needed
+        self._exc_terms: Optional[List[str]] = None
+        self._help_dialog = None  # Created on first _show_help
+        self._sort_by = 'date'  # Sort field for the current combo text
+        # Orientation checkbox states, kept in sync by stateChanged
+        self._orientation = {'portrait': True, 'landscape': True, 'square': True}
         
         self._setup_ui()
     
     def _setup_ui(self):
         """Set up the UI components."""
+        # Style - one sheet for all children, object names select per widget
+        self.setStyleSheet(_FILTER_BAR_QSS)
+        
         layout = QHBoxLayout(self)
         layout.setContentsMargins(10, 5, 10, 5)
         layout.setSpacing(10)
@@ -44,19 +190,9 @@ class FilterBar(QWidget):
         
         self.include_input = QLineEdit()
         self.include_input.setPlaceholderText('Enter terms (comma separated, or "quoted phrase")...')
-        self.include_input.returnPressed.connect(self._on_filter_changed)  # Trigger on Enter
-        self.include_input.setStyleSheet("""
-            QLineEdit {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4a9eff;
-            }
-        """)
+        self.include_input.returnPressed.connect(self._on_input_submitted)  # Trigger on Enter
+        self.include_input.textChanged.connect(self._invalidate_inc_cache)
+        self.include_input.setObjectName("includeInput")
         layout.addWidget(self.include_input, 2)
         
         # Exclude filter
@@ -65,57 +201,21 @@ class FilterBar(QWidget):
         
         self.exclude_input = QLineEdit()
         self.exclude_input.setPlaceholderText('Enter terms (comma separated, or "quoted phrase")...')
-        self.exclude_input.returnPressed.connect(self._on_filter_changed)  # Trigger on Enter
-        self.exclude_input.setStyleSheet("""
-            QLineEdit {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #ff6b6b;
-            }
-        """)
+        self.exclude_input.returnPressed.connect(self._on_input_submitted)  # Trigger on Enter
+        self.exclude_input.textChanged.connect(self._invalidate_exc_cache)
+        self.exclude_input.setObjectName("excludeInput")
         layout.addWidget(self.exclude_input, 2)
         
         # Search button
         self.search_btn = QPushButton("🔍 Search")
-        self.search_btn.clicked.connect(self._on_filter_changed)
-        self.search_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4a9eff;
-                color: #fff;
-                border: none;
-                padding: 5px 15px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #5aa9ff;
-            }
-            QPushButton:pressed {
-                background-color: #3a8eef;
-            }
-        """)
+        self.search_btn.clicked.connect(self._flush_filter)
+        self.search_btn.setObjectName("searchBtn")
         layout.addWidget(self.search_btn)
         
         # Clear button
         self.clear_btn = QPushButton("Clear")
         self.clear_btn.clicked.connect(self.clear_filters)
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                padding: 5px 15px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
+        self.clear_btn.setObjectName("clearBtn")
         layout.addWidget(self.clear_btn)
         
         # Help button
@@ -123,19 +223,7 @@ class FilterBar(QWidget):
         self.help_btn.setText("?")
         self.help_btn.setToolTip("Filter Help")
         self.help_btn.clicked.connect(self._show_help)
-        self.help_btn.setStyleSheet("""
-            QToolButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                border-radius: 12px;
-                width: 24px;
-                height: 24px;
-            }
-            QToolButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
+        self.help_btn.setObjectName("helpBtn")
         layout.addWidget(self.help_btn)
         
         # Orientation filter checkboxes
@@ -144,90 +232,67 @@ class FilterBar(QWidget):
         
         self.portrait_checkbox = QCheckBox("Portrait")
         self.portrait_checkbox.setChecked(True)
-        self.portrait_checkbox.stateChanged.connect(self._on_filter_changed)
-        self.portrait_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #eee;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4a9eff;
-            }
-        """)
+        self.portrait_checkbox.stateChanged.connect(partial(self._on_orientation_toggle, 'portrait'))
+        self.portrait_checkbox.setObjectName("orientationCheckbox")
         layout.addWidget(self.portrait_checkbox)
         
         self.landscape_checkbox = QCheckBox("Landscape")
         self.landscape_checkbox.setChecked(True)
-        self.landscape_checkbox.stateChanged.connect(self._on_filter_changed)
-        self.landscape_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #eee;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4a9eff;
-            }
-        """)
+        self.landscape_checkbox.stateChanged.connect(partial(self._on_orientation_toggle, 'landscape'))
+        self.landscape_checkbox.setObjectName("orientationCheckbox")
         layout.addWidget(self.landscape_checkbox)
         
         self.square_checkbox = QCheckBox("Square")
         self.square_checkbox.setChecked(True)
-        self.square_checkbox.stateChanged.connect(self._on_filter_changed)
-        self.square_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #eee;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4a9eff;
-            }
-        """)
+        self.square_checkbox.stateChanged.connect(partial(self._on_orientation_toggle, 'square'))
+        self.square_checkbox.setObjectName("orientationCheckbox")
         layout.addWidget(self.square_checkbox)
         
         # Results label
         self.results_label = QLabel("No images loaded")
-        self.results_label.setStyleSheet("color: #888;")
+        self.results_label.setObjectName("resultsLabel")
         layout.addWidget(self.results_label)
         
         layout.addStretch()
-        
-        # Set widget style
-        self.setStyleSheet("""
-            FilterBar {
-                background-color: #1e1e1e;
-                border-bottom: 1px solid #333;
-            }
-            QLabel {
-                color: #eee;
-            }
-        """)
     
-    def _on_input_changed(self):
-        """Handle input changes - no longer auto-triggers search."""
-        # Removed auto-trigger, user must press Enter or click Search
-        pass
+    def _normalized_text(self) -> tuple:
+        """Return the (include, exclude) text as the filter sees it."""
+        return (
+            self.include_input.text().strip().lower(),
+            self.exclude_input.text().strip().lower()
+        )
+    
+    def _on_input_submitted(self):
+        """Handle Enter in a filter input, skipping edits that change nothing."""
+        if self._normalized_text() == self._last_norm:
+            return
+        self._flush_filter()
     
     def _on_filter_changed(self):
-        """Emit filter changed signal."""
-        self.filter_changed.emit()
+        """Schedule a filter changed signal, coalescing bursts of changes."""
+        self._debounce_timer.start(50)
+    
+    def _flush_filter(self):
+        """Emit filter changed right away for explicit user actions."""
+        self._debounce_timer.stop()
+        self._emit_filter_changed()
+    
+    def _emit_filter_changed(self):
+        """Emit filter changed signal with a snapshot of the current criteria."""
+        self._snapshot_state()
+        self.filter_changed.emit(self._last_state)
+    
+    def _snapshot_state(self):
+        """Record the current criteria as the ones last applied."""
+        self._last_norm = self._normalized_text()
+        orientation = self._orientation
+        self._last_state = FilterState(
+            tuple(self.get_include_terms()),
+            tuple(self.get_exclude_terms()),
+            orientation['portrait'],
+            orientation['landscape'],
+            orientation['square']
+        )
     
     def _on_sort_changed(self):
         """Emit sort changed signal."""
@@ -235,12 +300,8 @@ class FilterBar(QWidget):
     
     def get_sort_by(self) -> str:
         """Get the current sort field."""
-        # Use external combo if it exists, otherwise fall back to internal (or default)
-        if hasattr(self, '_external_sort_combo'):
-            sort_text = self._external_sort_combo.currentText()
-        else:
-            sort_text = 'Date'  # Default
-        return self.SORT_OPTIONS.get(sort_text, 'date')
+        # Resolved in _on_sort_combo_changed whenever the combo changes
+        return self._sort_by
     
     def get_reverse_sort(self) -> bool:
         """Get whether reverse sort is enabled."""
@@ -252,6 +313,7 @@ class FilterBar(QWidget):
     def create_sort_controls(self, parent: Optional[QWidget] = None) -> QWidget:
         """Create a widget with sort controls for placement elsewhere."""
         container = QWidget(parent)
+        container.setStyleSheet(_SORT_CONTROLS_QSS)
         layout = QHBoxLayout(container)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(10)
@@ -260,27 +322,10 @@ class FilterBar(QWidget):
         
         # Create new combo box (don't reuse the hidden one)
         sort_combo = QComboBox()
-        sort_combo.addItems(list(self.SORT_OPTIONS.keys()))
+        sort_combo.addItems(self._SORT_KEYS)
         sort_combo.setCurrentText('Date')
+        self._sort_by = 'date'
         sort_combo.currentTextChanged.connect(self._on_sort_combo_changed)
-        sort_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                padding: 5px;
-                border-radius: 4px;
-                min-width: 100px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2a2a2a;
-                color: #eee;
-                selection-background-color: #4a9eff;
-            }
-        """)
         self._external_sort_combo = sort_combo
         layout.addWidget(sort_combo)
         
@@ -288,21 +333,6 @@ class FilterBar(QWidget):
         reverse_checkbox = QCheckBox("Reverse")
         reverse_checkbox.setChecked(False)
         reverse_checkbox.stateChanged.connect(self._on_reverse_checkbox_changed)
-        reverse_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #eee;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4a9eff;
-            }
-        """)
         self._external_reverse_checkbox = reverse_checkbox
         layout.addWidget(reverse_checkbox)
         
@@ -312,6 +342,7 @@ class FilterBar(QWidget):
     
     def _on_sort_combo_changed(self, text: str):
         """Handle external sort combo change."""
+        self._sort_by = self.SORT_OPTIONS.get(text, 'date')
         # Emit sort changed signal
         self.sort_changed.emit()
     
@@ -323,55 +354,67 @@ class FilterBar(QWidget):
     def _parse_terms(self, text: str) -> List[str]:
         """
         Parse filter terms, handling quoted phrases and comma separation.
+        Terms are returned lowercased.
         
         Examples:
-            'term1, term2' -> ['term1', 'term2']
+            'Term1, term2' -> ['term1', 'term2']
             '"quoted phrase", term' -> ['quoted phrase', 'term']
             'term1,term2,"phrase 1, phrase 2"' -> ['term1', 'term2', 'phrase 1, phrase 2']
         """
         if not text:
             return []
         
-        terms = []
-        current_term = []
-        in_quotes = False
+        # Matching is case-insensitive, so lowercase once here rather than
+        # per image in the filter loop
+        text = text.lower()
         
-        for char in text:
-            if char == '"':
-                in_quotes = not in_quotes
-            elif char == ',' and not in_quotes:
-                # End of term
-                term = ''.join(current_term).strip()
-                if term:
-                    terms.append(term)
-                current_term = []
-            else:
-                current_term.append(char)
+        # Fast path: without quotes every comma is a separator
+        if '"' not in text:
+            return [t for t in (part.strip() for part in text.split(',')) if t]
         
-        # Add last term
-        term = ''.join(current_term).strip()
-        if term:
-            terms.append(term)
-        
-        return terms
+        terms = (m.replace('"', '').strip() for m in _TERM_RE.findall(text))
+        return [term for term in terms if term]
+    
+    def _invalidate_inc_cache(self):
+        """Drop the parsed include terms after the input text changes."""
+        self._inc_terms = None
+    
+    def _invalidate_exc_cache(self):
+        """Drop the parsed exclude terms after the input text changes."""
+        self._exc_terms = None
     
     def get_include_terms(self) -> List[str]:
-        """Get list of include terms."""
-        text = self.include_input.text().strip()
-        return self._parse_terms(text)
+        """Get list of include terms (re-parsed only when the text changes)."""
+        if self._inc_terms is None:
+            self._inc_terms = self._parse_terms(self.include_input.text().strip())
+        return self._inc_terms
     
     def get_exclude_terms(self) -> List[str]:
-        """Get list of exclude terms."""
-        text = self.exclude_input.text().strip()
-        return self._parse_terms(text)
+        """Get list of exclude terms (re-parsed only when the text changes)."""
+        if self._exc_terms is None:
+            self._exc_terms = self._parse_terms(self.exclude_input.text().strip())
+        return self._exc_terms
+    
+    def _on_orientation_toggle(self, key: str, state: int):
+        """Record an orientation checkbox change and schedule a refilter."""
+        self._orientation[key] = state == Qt.CheckState.Checked.value
+        self._debounce_timer.start(50)
     
     def get_orientation_filters(self) -> dict:
-        """Get orientation filter settings."""
-        return {
-            'portrait': self.portrait_checkbox.isChecked(),
-            'landscape': self.landscape_checkbox.isChecked(),
-            'square': self.square_checkbox.isChecked()
-        }
+        """Get orientation filter settings (shared dict - do not modify)."""
+        return self._orientation
+    
+    def set_filter_text(self, include: str, exclude: str):
+        """
+        Set the filter inputs for a caller that applies the filters itself.
+        
+        Args:
+            include: Text for the include input
+            exclude: Text for the exclude input
+        """
+        self.include_input.setText(include)
+        self.exclude_input.setText(exclude)
+        self._snapshot_state()
     
     def clear_filters(self):
         """Clear all filter inputs."""
@@ -388,26 +431,11 @@ class FilterBar(QWidget):
     
     def _show_help(self):
         """Show filter help dialog."""
-        from PyQt6.QtWidgets import QMessageBox
-        
-        help_text = """
-        <h3>Filter Help</h3>
-        <p><b>Include:</b> Only show images whose prompt contains ALL of these terms.<br>
-        Separate multiple terms with commas. Use quotes for phrases with commas.</p>
-        <p><b>Exclude:</b> Hide images whose prompt contains ANY of these terms.<br>
-        Separate multiple terms with commas. Use quotes for phrases with commas.</p>
-        <p><b>Examples:</b></p>
-        <ul>
-            <li>Include: <code>blue sky, clouds</code> → Shows images with both "blue sky" AND "clouds"</li>
-            <li>Include: <code>"blue sky", clouds</code> → Shows images with "blue sky" (as phrase) AND "clouds"</li>
-            <li>Exclude: <code>nsfw, blurry</code> → Hides images with "nsfw" OR "blurry"</li>
-        </ul>
-        <p>Filtering is case-insensitive. Press Enter or click Search to apply filters.</p>
-        """
-        
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Filter Help")
-        msg.setTextFormat(Qt.TextFormat.RichText)
-        msg.setText(help_text)
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-        msg.exec()
+        # Build the dialog on first use and reuse it afterwards
+        if self._help_dialog is None:
+            self._help_dialog = QMessageBox(self)
+            self._help_dialog.setWindowTitle("Filter Help")
+            self._help_dialog.setTextFormat(Qt.TextFormat.RichText)
+            self._help_dialog.setText(_HELP_HTML)
+            self._help_dialog.setStandardButtons(QMessageBox.StandardButton.Ok)
+        self._help_dialog.exec()
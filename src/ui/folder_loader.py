@@ -1,4 +1,7 @@
 """Asynchronous folder loading worker."""
+import threading
+import time
+import traceback
 from PyQt6.QtCore import QThread, pyqtSignal
 from typing import List, Optional
 
@@ -21,29 +24,43 @@ class FolderLoaderThread(QThread):
         self.use_cache = use_cache
         self.skip_validation = skip_validation
         self.recursive = recursive
-        self._cancelled = False
+        self._cancel_evt = threading.Event()  # Set from the UI thread by cancel()
         
     def run(self):
         """Run the loading process."""
+        is_cancelled = self._cancel_evt.is_set
+        if is_cancelled():
+            return
         try:
             images = None
-            metadata_cache = MetadataCache()
+            metadata_cache = None  # Only built when a cache flag needs it
             
             # Try to load from cache if enabled
             if self.use_cache or self.skip_validation:
+                metadata_cache = MetadataCache()
                 self.progress_update.emit(0, 0, "Loading from cache...")
                 cached_images = metadata_cache.load_cache(self.folder, skip_validation=self.skip_validation)
                 if cached_images is not None:
                     images = cached_images
                     self.progress_update.emit(len(images), len(images), f"Loaded {len(images)} images from cache")
             
+            if is_cancelled():
+                return
+            
             # If not cached and not skipping updates, scan the directory
             if images is None and not self.skip_validation:
                 self.progress_update.emit(0, 0, "Scanning folder...")
                 
+                last_emit = [0.0]
+                
                 def progress_callback(current, total):
-                    if self._cancelled:
+                    if is_cancelled():
                         return False
+                    # Throttle to ~20 updates/sec, but always report the final one
+                    now = time.monotonic()
+                    if current != total and now - last_emit[0] < 0.05:
+                        return True
+                    last_emit[0] = now
                     self.progress_update.emit(current, total, f"Scanning images... {current}/{total}")
                     return True
                 
@@ -51,23 +68,29 @@ class FolderLoaderThread(QThread):
                 images = scanner.scan_directory(self.folder, recursive=self.recursive)
                 
                 # Save to cache if enabled
-                if self.use_cache and not self._cancelled:
-                    self.progress_update.emit(0, 0, "Saving to cache...")
-                    metadata_cache.save_cache(self.folder, images)
+                if self.use_cache and not is_cancelled():
+                    metadata_cache = metadata_cache or MetadataCache()
+                    # Skip the rewrite when the scan matches what is already cached
+                    signature = metadata_cache.compute_signature(images)
+                    if signature != metadata_cache.get_signature(self.folder):
+                        self.progress_update.emit(0, 0, "Saving to cache...")
+                        metadata_cache.save_cache(self.folder, images)
             
             # If skipping updates and no cache, error
             if images is None and self.skip_validation:
                 self.loading_failed.emit("No cached data available for this folder.\n\nRun without --skip-db-update first to build the cache.")
                 return
             
-            if not self._cancelled:
+            if not is_cancelled():
                 self.loading_complete.emit(images)
                 
+        except FileNotFoundError as e:
+            # Missing folder is an expected user error - no traceback needed
+            self.loading_failed.emit(str(e))
         except Exception as e:
-            import traceback
             error_msg = f"{str(e)}\n\n{traceback.format_exc()}"
             self.loading_failed.emit(error_msg)
     
     def cancel(self):
         """Cancel the loading process."""
-        self._cancelled = True
+        self._cancel_evt.set()
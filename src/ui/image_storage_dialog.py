@@ -1,13 +1,22 @@
 """Dialog for managing image storage."""
+import hashlib
+import logging
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QProgressDialog, QMessageBox, QTableWidget, QTableWidgetItem,
+    QProgressDialog, QMessageBox, QTableView, QAbstractItemView,
     QHeaderView, QCheckBox, QGroupBox, QSpinBox, QFileDialog,
-    QLineEdit, QComboBox
+    QLineEdit, QComboBox, QGridLayout
+)
+from PyQt6.QtCore import (
+    Qt, QThread, QTimer, pyqtSignal, QSettings, QAbstractTableModel, QModelIndex
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
 from PyQt6.QtGui import QFont
 
 from ..core.image_storage import ImageStorage
@@ -16,13 +25,646 @@ from ..core.image_scanner import ImageScanner
 from ..core.metadata_parser import MetadataParser
 from ..models.image_data import ImageMetadata
 
+logger = logging.getLogger(__name__)
+
+# One stylesheet for the dialog, parsed once at import; the backend status
+# colour is selected by the label's "connected" property
+_DIALOG_QSS = """
+    QDialog {
+        background-color: #252525;
+    }
+    QGroupBox {
+        color: #eee;
+        border: 1px solid #444;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+    QLabel {
+        color: #eee;
+    }
+    QPushButton {
+        background-color: #3a3a3a;
+        color: #eee;
+        border: 1px solid #555;
+        padding: 8px 15px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #4a4a4a;
+    }
+    QPushButton:disabled {
+        background-color: #2a2a2a;
+        color: #666;
+    }
+    QTableView {
+        background-color: #2a2a2a;
+        color: #eee;
+        border: 1px solid #444;
+        gridline-color: #444;
+    }
+    QTableView::item:selected {
+        background-color: #4a9eff;
+    }
+    QHeaderView::section {
+        background-color: #3a3a3a;
+        color: #eee;
+        padding: 5px;
+        border: 1px solid #444;
+    }
+    QCheckBox {
+        color: #eee;
+    }
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+    }
+    QLabel#backendStatus[connected="true"] {
+        color: #4caf50;
+    }
+    QLabel#backendStatus[connected="false"] {
+        color: #ff6b6b;
+    }
+"""
+
+
+class ImportThread(QThread):
+    """Worker thread that scans a folder and stores its images."""
+
+    # Signals
+    progress_update = pyqtSignal(int, int, str)  # current, total, message
+    import_complete = pyqtSignal(int, int, int)  # imported, skipped, failed
+    import_failed = pyqtSignal(str)  # error message
+
+    COMMIT_BATCH = 500  # SQLite stores per transaction
+    PROGRESS_INTERVAL = 0.033  # Seconds between progress signals (~30 Hz)
+    READ_WORKERS = 4  # Threads reading and hashing files ahead of the writer
+    PG_BATCH = 100  # PostgreSQL images per INSERT/transaction
+    PG_BATCH_BYTES = 256 * 1024 * 1024  # Flush earlier if the buffered images get this large
+
+    def __init__(self, folder: str, storage, delete_originals: bool = False):
+        """
+        Initialize the import worker.
+
+        Args:
+            folder: Folder to import images from
+            storage: Target backend. For SQLite the worker opens its own
+                connection to the same database, since sqlite3 connections
+                cannot be shared across threads.
+            delete_originals: If True, delete original files after storing
+        """
+        super().__init__()
+        self.folder = folder
+        self.storage = storage
+        self.delete_originals = delete_originals
+        self._cancel_evt = threading.Event()
+        self._last_progress = 0.0
+
+    def _emit_progress(self, current: int, total: int, message: str):
+        """Emit progress at most every PROGRESS_INTERVAL, and always on completion."""
+        now = time.monotonic()
+        if current >= total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress_update.emit(current, total, message)
+
+    def run(self):
+        """Scan the folder and store every image found."""
+        is_cancelled = self._cancel_evt.is_set
+        imported = 0
+        skipped = 0
+        failed = 0
+        is_postgres = isinstance(self.storage, PostgresImageStorage)
+        # The SQLite connection is opened inside the try below, so a failure
+        # to open it is reported like any other import error
+        storage = self.storage if is_postgres else None
+
+        # Originals are unlinked on a background thread once their rows are
+        # committed, so filesystem work stays off the store loop
+        unlink_queue = queue.Queue()
+        unlinked = []  # Originals actually removed, filled by the unlink thread
+        committed_originals = []  # SQLite originals waiting for the next commit
+        uncommitted = 0  # SQLite rows stored since the last commit
+        if self.delete_originals:
+            threading.Thread(
+                target=self._unlink_worker, args=(unlink_queue, unlinked), daemon=True
+            ).start()
+
+        def commit_sqlite():
+            nonlocal uncommitted
+            storage.commit()
+            uncommitted = 0
+            for path in committed_originals:
+                unlink_queue.put(path)
+            committed_originals.clear()
+
+        try:
+            if not is_postgres:
+                storage = ImageStorage(self.storage.db_path)
+
+            def progress_callback(current, total):
+                self._emit_progress(current, total, "Scanning images...")
+                return not is_cancelled()
+
+            scanner = ImageScanner(progress_callback=progress_callback)
+            images = scanner.scan_directory(self.folder)
+            total = len(images)
+
+            # Files are read and hashed on a small pool, a bounded window
+            # ahead of this thread, which does every database write itself:
+            # SQLite allows one writer and psycopg2 shares one connection.
+            images_iter = iter(images)
+            pending = deque()
+            pg_batch = []
+            pg_batch_bytes = 0
+
+            def flush_pg_batch():
+                nonlocal imported, skipped, failed, pg_batch_bytes
+                stored = storage.store_batch(pg_batch)
+                if stored is None:
+                    stored = {}
+                    failed += len(pg_batch)
+                else:
+                    # The rest were already stored, by content or by path
+                    skipped += len(pg_batch) - len(stored)
+                imported += len(stored)
+                # Note: PostgreSQL storage doesn't support delete_original in the same way
+                if self.delete_originals:
+                    for path in stored:
+                        unlink_queue.put(path)
+                pg_batch.clear()
+                pg_batch_bytes = 0
+
+            with ThreadPoolExecutor(max_workers=self.READ_WORKERS) as pool:
+                def submit_next():
+                    metadata = next(images_iter, None)
+                    if metadata is not None:
+                        pending.append((metadata, pool.submit(self._read_file, metadata.file_path)))
+
+                for _ in range(self.READ_WORKERS * 2):
+                    submit_next()
+
+                done = 0
+                while pending:
+                    if is_cancelled():
+                        for _, future in pending:
+                            future.cancel()
+                        break
+
+                    metadata, future = pending.popleft()
+                    submit_next()
+                    done += 1
+
+                    try:
+                        image_data, file_hash = future.result()
+                    except OSError as e:
+                        logger.error("Failed to read %s: %s", metadata.file_path, e)
+                        failed += 1
+                        self._emit_progress(done, total, f"Importing {metadata.file_name}...")
+                        continue
+
+                    if is_postgres:
+                        # Use PostgreSQL storage, one multi-row INSERT per batch
+                        pg_batch.append((metadata, image_data, file_hash))
+                        pg_batch_bytes += len(image_data)
+                        if len(pg_batch) >= self.PG_BATCH or pg_batch_bytes >= self.PG_BATCH_BYTES:
+                            flush_pg_batch()
+                    elif not self.delete_originals and storage.is_stored_unchanged(metadata.file_path, file_hash):
+                        # Re-import of an unchanged file; keep the stored BLOB
+                        skipped += 1
+                    else:
+                        # Use SQLite storage, committing in batches rather than per image
+                        if storage.store_image(metadata, image_data, commit=False, file_hash=file_hash):
+                            imported += 1
+                            uncommitted += 1
+                            if self.delete_originals:
+                                committed_originals.append(metadata.file_path)
+                            if uncommitted >= self.COMMIT_BATCH:
+                                commit_sqlite()
+                        else:
+                            failed += 1
+
+                    self._emit_progress(done, total, f"Importing {metadata.file_name}...")
+
+                if pg_batch:
+                    flush_pg_batch()
+
+        except Exception as e:
+            error = str(e)
+        else:
+            error = None
+        finally:
+            if storage is not None and not is_postgres:
+                commit_sqlite()
+            if self.delete_originals:
+                unlink_queue.put(None)
+                unlink_queue.join()
+            if storage is not None and not is_postgres:
+                # Flag the removed originals in one transaction
+                if unlinked:
+                    storage.delete_images(unlinked, delete_data=False)
+                storage.close()
+
+        # Exactly one of the two finishing signals, once cleanup is done
+        if error is not None:
+            self.import_failed.emit(error)
+            return
+        self.import_complete.emit(imported, skipped, failed)
+
+    @staticmethod
+    def _read_file(file_path: str) -> tuple:
+        """Read a file and hash it; runs on the read pool."""
+        with open(file_path, 'rb') as f:
+            image_data = f.read()
+        return image_data, hashlib.sha256(image_data).hexdigest()
+
+    @staticmethod
+    def _unlink_worker(paths: queue.Queue, unlinked: List[str]):
+        """Delete queued original files until a None sentinel arrives."""
+        unlink = os.unlink
+        while True:
+            path = paths.get()
+            if path is None:
+                paths.task_done()
+                return
+            try:
+                unlink(path)
+                unlinked.append(path)
+            except OSError as e:
+                logger.warning("Failed to delete original: %s", e)
+            paths.task_done()
+
+    def cancel(self):
+        """Cancel the import after the current image."""
+        self._cancel_evt.set()
+
+
+class CleanupScanThread(QThread):
+    """Worker thread that finds stored images whose original file is gone."""
+
+    # Signals
+    progress_update = pyqtSignal(int, int)  # directories done, directories total
+    scan_complete = pyqtSignal(list)  # orphaned original paths
+    scan_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+
+    def run(self):
+        """Scan for orphaned entries on a private SQLite connection."""
+        try:
+            with ImageStorage(self.db_path) as storage:
+                orphaned = storage.cleanup_deleted_originals(
+                    dry_run=True,
+                    progress_callback=self.progress_update.emit
+                )
+            self.scan_complete.emit(orphaned)
+        except Exception as e:
+            self.scan_failed.emit(str(e))
+
+
+class ExportThread(QThread):
+    """Worker thread that exports stored images to files through a thread pool."""
+
+    # Signals
+    progress_update = pyqtSignal(int)  # exports finished so far
+    export_complete = pyqtSignal(int, int)  # exported, failed
+
+    MAX_WORKERS = 8
+
+    def __init__(self, storage, jobs: List[tuple], max_workers: int = MAX_WORKERS):
+        """
+        Initialize the export worker.
+
+        Args:
+            storage: Backend whose export_image(key, destination) is called
+            jobs: (key, destination) pairs; a None key counts as a failure
+            max_workers: Number of exports to run at once
+        """
+        super().__init__()
+        self.storage = storage
+        self.jobs = jobs
+        self.max_workers = max_workers
+        self._cancel_evt = threading.Event()
+
+    def _export_one(self, key, destination: str) -> bool:
+        """Export a single image unless the export was cancelled."""
+        if key is None or self._cancel_evt.is_set():
+            return False
+        return self.storage.export_image(key, destination)
+
+    def run(self):
+        """Run all exports and report the totals."""
+        exported = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._export_one, key, dest) for key, dest in self.jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    exported += 1
+                else:
+                    failed += 1
+                self.progress_update.emit(done)
+        self.export_complete.emit(exported, failed)
+
+    def cancel(self):
+        """Skip exports that have not started yet."""
+        self._cancel_evt.set()
+
+
+class StoredImagesModel(QAbstractTableModel):
+    """
+    Table model over stored images.
+
+    SQLite rows are listed by rowid and fetched a page at a time as they are
+    painted. PostgreSQL rows are appended page by page through fetchMore()
+    as the view scrolls towards the end.
+    """
+
+    HEADERS = ("File Name", "Dimensions", "Size", "Stored At", "Original Deleted")
+    PAGE_SIZE = 200
+    MAX_PAGES = 20  # Pages kept in the LRU cache
+    PG_PAGE_SIZE = 500  # PostgreSQL rows per fetchMore()
+    DB_ID_ROLE = Qt.ItemDataRole.UserRole + 1  # Database id of the row's image
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._storage = None
+        self._rowids: List[int] = []
+        self._page_cache: OrderedDict = OrderedDict()  # page number -> {rowid: row}
+        self._rows: Optional[List[dict]] = None  # Rows loaded so far (PostgreSQL)
+        self._more_available = False  # PostgreSQL has rows past the last loaded page
+        self._more_loader: Optional["MetadataLoader"] = None  # Running fetchMore() load
+
+    @staticmethod
+    def fetch_rows(storage, after: Optional[tuple] = None) -> list:
+        """
+        Read the row list from a storage backend. Safe to call off the GUI thread.
+
+        Args:
+            storage: ImageStorage or PostgresImageStorage
+            after: PostgreSQL only; (stored_at, id) of the last loaded row
+
+        Returns:
+            All rowids for SQLite, or one page of row dicts for PostgreSQL
+        """
+        if isinstance(storage, PostgresImageStorage):
+            rows = storage.get_table_page(after, StoredImagesModel.PG_PAGE_SIZE)
+            return [StoredImagesModel._with_cells(row, postgres=True) for row in rows]
+        return storage.get_stored_rowids()
+
+    @staticmethod
+    def _with_cells(row: dict, postgres: bool = False) -> dict:
+        """
+        Format a row's display strings once, so data() is a plain lookup.
+
+        Args:
+            row: Row dict from get_table_rows() or fetch_rows()
+            postgres: PostgreSQL rows have no stored_at or original_deleted
+
+        Returns:
+            The same dict with a 'cells' tuple added
+        """
+        if postgres:
+            stored_at = deleted = "N/A"
+        else:
+            stored_at = str(row['stored_at'] or "Unknown")
+            deleted = "Yes" if row['original_deleted'] else "No"
+        row['cells'] = (
+            row['file_name'],
+            f"{row['width']}x{row['height']}",
+            f"{row['file_size'] / (1024 * 1024):.2f} MB",
+            stored_at,
+            deleted,
+        )
+        return row
+
+    def set_storage(self, storage) -> None:
+        """
+        Reload the row list from a storage backend on the calling thread.
+
+        Args:
+            storage: ImageStorage, PostgresImageStorage or None to clear the model
+        """
+        self.set_rows(storage, self.fetch_rows(storage) if storage is not None else [])
+
+    def set_rows(self, storage, rows: list) -> None:
+        """
+        Show rows previously read with fetch_rows().
+
+        Args:
+            storage: Backend the rows were read from, or None
+            rows: Result of fetch_rows(storage)
+        """
+        is_postgres = isinstance(storage, PostgresImageStorage)
+        if storage is not None and storage is self._storage and not is_postgres:
+            # Same SQLite database: apply the change as row inserts/removals
+            self._update_rowids(rows)
+            return
+
+        self.beginResetModel()
+        self._storage = storage
+        self._page_cache.clear()
+        self._rowids, self._rows = [], None
+        self._more_loader = None
+        if is_postgres:
+            self._rows = rows
+            self._more_available = len(rows) == self.PG_PAGE_SIZE
+        else:
+            self._rowids = rows
+            self._more_available = False
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return (not parent.isValid() and self._more_available
+                and self._more_loader is None)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        """Load the next PostgreSQL page on a worker thread."""
+        if not self.canFetchMore(parent):
+            return
+        last = self._rows[-1]
+        loader = MetadataLoader(self._storage, self, after=(last['stored_at'], last['id']))
+        loader.finished_with_data.connect(self._on_more_rows)
+        loader.finished.connect(loader.deleteLater)
+        self._more_loader = loader
+        loader.start()
+
+    def _on_more_rows(self, rows: list) -> None:
+        """Append a page loaded by fetchMore()."""
+        if self.sender() is not self._more_loader:
+            return  # The model was reset while the page loaded
+        self._more_loader = None
+        self._more_available = len(rows) == self.PG_PAGE_SIZE
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _update_rowids(self, rowids: List[int]) -> None:
+        """
+        Switch to a new rowid list, keeping selection and scroll position
+        when only new imports were added or some rows were removed.
+
+        Args:
+            rowids: Rowids in display order
+        """
+        old = self._rowids
+        # Page contents are keyed by row position, so any shift invalidates them
+        self._page_cache.clear()
+
+        if rowids == old:
+            if old:
+                self.dataChanged.emit(
+                    self.index(0, 0), self.index(len(old) - 1, len(self.HEADERS) - 1)
+                )
+            return
+
+        added = len(rowids) - len(old)
+        if added > 0 and rowids[added:] == old:
+            # New imports sort first (newest stored_at)
+            self.beginInsertRows(QModelIndex(), 0, added - 1)
+            self._rowids = rowids
+            self.endInsertRows()
+            return
+
+        if added < 0:
+            kept = set(rowids)
+            if [rowid for rowid in old if rowid in kept] == rowids:
+                # Collect contiguous runs of removed rows, then remove bottom-up
+                runs = []
+                for row, rowid in enumerate(old):
+                    if rowid in kept:
+                        continue
+                    if runs and runs[-1][1] == row - 1:
+                        runs[-1][1] = row
+                    else:
+                        runs.append([row, row])
+                for first, last in reversed(runs):
+                    self.beginRemoveRows(QModelIndex(), first, last)
+                    del self._rowids[first:last + 1]
+                    self.endRemoveRows()
+                return
+
+        self.beginResetModel()
+        self._rowids = rowids
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.set_storage(None)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self._rows is not None else len(self._rowids)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def row_data(self, row: int) -> Optional[dict]:
+        """
+        Get the displayed fields of a row, fetching its page on a cache miss.
+
+        Args:
+            row: Row number in the model
+
+        Returns:
+            Row dict, or None if the image was deleted since the list was loaded
+        """
+        if self._rows is not None:
+            return self._rows[row]
+
+        page = row // self.PAGE_SIZE
+        cached = self._page_cache.get(page)
+        if cached is None:
+            start = page * self.PAGE_SIZE
+            cached = self._storage.get_table_rows(self._rowids[start:start + self.PAGE_SIZE])
+            for data in cached.values():
+                self._with_cells(data)
+            self._page_cache[page] = cached
+            if len(self._page_cache) > self.MAX_PAGES:
+                self._page_cache.popitem(last=False)
+        else:
+            self._page_cache.move_to_end(page)
+        return cached.get(self._rowids[row])
+
+    def row_path(self, row: int) -> Optional[str]:
+        """Get the original path of a row."""
+        data = self.row_data(row)
+        return data['original_path'] if data else None
+
+    def row_name(self, row: int) -> Optional[str]:
+        """Get the file name of a row."""
+        data = self.row_data(row)
+        return data['file_name'] if data else None
+
+    def row_db_id(self, row: int) -> Optional[int]:
+        """Get the database id of a row (the PostgreSQL id, or the SQLite rowid)."""
+        if self._rows is not None:
+            return self._rows[row]['id']
+        return self._rowids[row]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == self.DB_ID_ROLE:
+            return self.row_db_id(index.row())
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            return None
+        row = self.row_data(index.row())
+        if row is None:
+            return None
+        if role == Qt.ItemDataRole.UserRole:
+            return row['original_path']
+        return row['cells'][index.column()]
+
+
+class MetadataLoader(QThread):
+    """Worker thread that reads the stored image list for StoredImagesModel."""
+
+    # Signals
+    finished_with_data = pyqtSignal(list)  # result of StoredImagesModel.fetch_rows
+    load_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, storage, parent=None, after: Optional[tuple] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            storage: Backend to read from
+            parent: Owning QObject
+            after: PostgreSQL only; key of the last loaded row, to read the next page
+        """
+        super().__init__(parent)
+        self.storage = storage
+        self.after = after
+
+    def run(self):
+        """Read the row list and hand it to the GUI thread."""
+        try:
+            self.finished_with_data.emit(StoredImagesModel.fetch_rows(self.storage, self.after))
+        except Exception as e:
+            self.load_failed.emit(str(e))
+
 
 class ImageStorageDialog(QDialog):
     """Dialog for managing image storage and cleanup."""
 
     def __init__(self, parent=None, skip_update: bool = False):
         super().__init__(parent)
-        print("[DEBUG] ImageStorageDialog.__init__ starting...")
+        logger.debug("ImageStorageDialog.__init__ starting...")
         self.setWindowTitle("Image Storage Manager")
         self.setMinimumSize(800, 600)
         
@@ -33,49 +675,55 @@ class ImageStorageDialog(QDialog):
         self.settings = QSettings("SDImageViewer", "Settings")
         
         # Initialize storage backends
-        print("[DEBUG] Creating ImageStorage instance...")
+        logger.debug("Creating ImageStorage instance...")
         self.storage = ImageStorage()
-        print("[DEBUG] ImageStorage created successfully")
+        logger.debug("ImageStorage created successfully")
+        
+        self._last_fingerprint = None  # Table fingerprint at the last list fill
+        self._loader: Optional[MetadataLoader] = None  # Loader of the newest refresh
+        self._refresh_pending = False  # A _do_refresh is queued for the next event loop pass
+        self._loaded_once = False  # The first showEvent queues the initial load
         
         # Initialize PostgreSQL storage if configured
         self.postgres_storage = None
+        self._pg_conn_string: Optional[str] = None  # Built once by _build_postgres_connection_string
         self._init_postgres_storage()
 
-        print("[DEBUG] Setting up UI...")
+        logger.debug("Setting up UI...")
+        # The list and stats load on first show (see showEvent)
         self._setup_ui()
-        print("[DEBUG] UI setup complete")
-
-        print("[DEBUG] Refreshing stats...")
-        self._refresh_stats()
-        print("[DEBUG] Stats refresh complete")
+        logger.debug("UI setup complete")
     
     def _build_postgres_connection_string(self) -> str:
-        """Build PostgreSQL connection string from settings and env vars."""
-        host = self.settings.value("postgres_host", "") or os.environ.get("POSTGRES_IP", "")
-        port = self.settings.value("postgres_port", "5432")
-        database = self.settings.value("postgres_db", "sd_images")
-        user = self.settings.value("postgres_user", "") or os.environ.get("POSTGRES_USER", "")
+        """Build PostgreSQL connection string from settings and env vars, once per dialog."""
+        if self._pg_conn_string is not None:
+            return self._pg_conn_string
+        
+        settings = self.settings
+        host = settings.value("postgres_host", "") or os.environ.get("POSTGRES_IP", "")
+        user = settings.value("postgres_user", "") or os.environ.get("POSTGRES_USER", "")
         password = os.environ.get("POSTGRES_PASS", "")
         
         if not all([host, user, password]):
-            return ""
-        
-        return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+            self._pg_conn_string = ""
+        else:
+            port = settings.value("postgres_port", "5432")
+            database = settings.value("postgres_db", "sd_images")
+            self._pg_conn_string = f"postgresql://{user}:{password}@{host}:{port}/{database}"
+        return self._pg_conn_string
     
     def _init_postgres_storage(self):
         """Initialize PostgreSQL storage if enabled in settings."""
-        postgres_enabled = self.settings.value("postgres_enabled", False)
-        if isinstance(postgres_enabled, str):
-            postgres_enabled = postgres_enabled.lower() == "true"
-        
-        if postgres_enabled and POSTGRES_AVAILABLE:
+        # Check the cheap module flag first; QSettings parses "true"/"false" strings itself
+        if POSTGRES_AVAILABLE and self.settings.value("postgres_enabled", False, type=bool):
             conn_string = self._build_postgres_connection_string()
             if conn_string:
                 try:
                     self.postgres_storage = PostgresImageStorage(conn_string)
-                    print(f"[DEBUG] PostgreSQL storage initialized: {self.postgres_storage.is_connected()}")
+                    if logger.isEnabledFor(logging.DEBUG):  # is_connected() pings the server
+                        logger.debug("PostgreSQL storage initialized: %s", self.postgres_storage.is_connected())
                 except Exception as e:
-                    print(f"[ERROR] Failed to initialize PostgreSQL storage: {e}")
+                    logger.error("Failed to initialize PostgreSQL storage: %s", e)
                     self.postgres_storage = None
     
     def _get_active_storage(self):
@@ -112,6 +760,7 @@ class ImageStorageDialog(QDialog):
         
         # Connection status
         self.backend_status = QLabel()
+        self.backend_status.setObjectName("backendStatus")
         self._update_backend_status()
         backend_layout.addWidget(self.backend_status)
         
@@ -122,10 +771,18 @@ class ImageStorageDialog(QDialog):
         stats_group = QGroupBox("Storage Statistics")
         stats_layout = QVBoxLayout(stats_group)
         
+        stats_group.setFont(QFont("Monospace", 10))
+        
+        # Status messages (loading, not connected, disabled)
         self.stats_label = QLabel("Loading...")
-        self.stats_label.setFont(QFont("Monospace", 10))
         stats_layout.addWidget(self.stats_label)
         
+        # Name/value label pairs, created on demand by _show_stats
+        self.stats_grid = QGridLayout()
+        self.stats_grid.setColumnStretch(1, 1)
+        self._stat_rows: List[tuple] = []
+        stats_layout.addLayout(self.stats_grid)
+        
         layout.addWidget(stats_group)
         
         # Import section
@@ -180,16 +837,18 @@ class ImageStorageDialog(QDialog):
         layout.addWidget(cleanup_group)
         
         # Stored images table
-        table_group = QGroupBox("Stored Images")
-        table_layout = QVBoxLayout(table_group)
-        
-        self.images_table = QTableWidget()
-        self.images_table.setColumnCount(5)
-        self.images_table.setHorizontalHeaderLabels([
-            "File Name", "Dimensions", "Size", "Stored At", "Original Deleted"
-        ])
+        self.table_group = QGroupBox("Stored Images")
+        table_layout = QVBoxLayout(self.table_group)
+        
+        self.images_model = StoredImagesModel(self)
+        self.images_table = QTableView()
+        self.images_table.setModel(self.images_model)
         self.images_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.images_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.images_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Fixed-height rows: the view never measures row contents
+        vertical_header = self.images_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.images_table.fontMetrics().height() + 8)
         self.images_table.setAlternatingRowColors(True)
         table_layout.addWidget(self.images_table)
         
@@ -211,7 +870,7 @@ class ImageStorageDialog(QDialog):
         table_btn_layout.addStretch()
         table_layout.addLayout(table_btn_layout)
         
-        layout.addWidget(table_group, 1)  # Give table stretch priority
+        layout.addWidget(self.table_group, 1)  # Give table stretch priority
         
         # Close button
         close_btn = QPushButton("Close")
@@ -219,69 +878,47 @@ class ImageStorageDialog(QDialog):
         layout.addWidget(close_btn)
         
         # Style
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #252525;
-            }
-            QGroupBox {
-                color: #eee;
-                border: 1px solid #444;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QLabel {
-                color: #eee;
-            }
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                padding: 8px 15px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-            QPushButton:disabled {
-                background-color: #2a2a2a;
-                color: #666;
-            }
-            QTableWidget {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                gridline-color: #444;
-            }
-            QTableWidget::item:selected {
-                background-color: #4a9eff;
-            }
-            QHeaderView::section {
-                background-color: #3a3a3a;
-                color: #eee;
-                padding: 5px;
-                border: 1px solid #444;
-            }
-            QCheckBox {
-                color: #eee;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-        """)
-        
-        # Initial load
-        self._refresh_image_list()
+        self.setStyleSheet(_DIALOG_QSS)
+    
+    def showEvent(self, event):
+        """Load the list and stats the first time the dialog is shown."""
+        super().showEvent(event)
+        if not self._loaded_once:
+            self._loaded_once = True
+            # Let the dialog paint before the first query runs
+            self._queue_refresh()
+    
+    def done(self, result: int):
+        """Close the dialog's database connections along with the dialog."""
+        # The dialog stays alive as a child of the main window, so its
+        # connections would otherwise be held until the application exits.
+        # List loaders read through self.storage; let them finish first.
+        for loader in (self._loader, self.images_model._more_loader):
+            if loader is not None:
+                loader.wait()
+        self.storage.close()
+        if self.postgres_storage:
+            self.postgres_storage.close()
+        super().done(result)
     
     def _on_storage_changed(self, index):
         """Handle storage backend change."""
         self._update_backend_status()
-        self._refresh_stats()
+        self._queue_refresh()
+    
+    def _queue_refresh(self):
+        """
+        Refresh the list (and with it the stats) on the next event loop pass.
+        
+        Requests made before that pass collapse into a single refresh.
+        """
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run the refresh queued by _queue_refresh."""
+        self._refresh_pending = False
         self._refresh_image_list()
     
     def _update_backend_status(self):
@@ -289,15 +926,18 @@ class ImageStorageDialog(QDialog):
         storage_type = self.storage_combo.currentData()
         
         if storage_type == "postgres":
-            if self.postgres_storage and self.postgres_storage.is_connected():
-                self.backend_status.setText("✅ Connected")
-                self.backend_status.setStyleSheet("color: #4caf50;")
-            else:
-                self.backend_status.setText("❌ Not connected")
-                self.backend_status.setStyleSheet("color: #ff6b6b;")
+            connected = bool(self.postgres_storage and self.postgres_storage.is_connected())
+            text = "✅ Connected" if connected else "❌ Not connected"
         else:
-            self.backend_status.setText("✅ Ready")
-            self.backend_status.setStyleSheet("color: #4caf50;")
+            connected, text = True, "✅ Ready"
+        
+        label = self.backend_status
+        label.setText(text)
+        if label.property("connected") != connected:
+            label.setProperty("connected", connected)
+            # Re-apply the dialog stylesheet rules for the new property value
+            label.style().unpolish(label)
+            label.style().polish(label)
     
     def _refresh_stats(self):
         """Refresh storage statistics display."""
@@ -306,78 +946,136 @@ class ImageStorageDialog(QDialog):
         if isinstance(storage, PostgresImageStorage):
             stats = storage.get_storage_stats()
             if stats.get('connected'):
-                stats_text = f"""
-<b>Backend:</b> PostgreSQL
-<b>Connected:</b> Yes
-<b>Total Images:</b> {stats.get('total_images', 0)}
-<b>Total Size:</b> {stats.get('total_size_mb', 0):.2f} MB
-<b>Database Size:</b> {stats.get('database_size', 'Unknown')}
-                """.strip()
+                self._show_stats([
+                    ("Backend:", "PostgreSQL"),
+                    ("Connected:", "Yes"),
+                    ("Total Images:", str(stats.get('total_images', 0))),
+                    ("Total Size:", f"{stats.get('total_size_mb', 0):.2f} MB"),
+                    ("Database Size:", str(stats.get('database_size', 'Unknown'))),
+                ])
             else:
-                stats_text = "<b>Backend:</b> PostgreSQL<br><b>Status:</b> Not connected"
+                self._show_stats_message("<b>Backend:</b> PostgreSQL<br><b>Status:</b> Not connected")
         else:
             stats = self.storage.get_storage_stats()
-            stats_text = f"""
-<b>Backend:</b> Local SQLite
-<b>Total Images:</b> {stats['total_images']}
-<b>Deleted Originals:</b> {stats['deleted_originals']}
-<b>Original Size:</b> {stats['original_size_mb']:.2f} MB
-<b>Storage Size:</b> {stats['storage_size_mb']:.2f} MB
-<b>Database File:</b> {stats['database_size_mb']:.2f} MB
-            """.strip()
-        
-        self.stats_label.setText(stats_text)
+            self._show_stats([
+                ("Backend:", "Local SQLite"),
+                ("Total Images:", str(stats['total_images'])),
+                ("Deleted Originals:", str(stats['deleted_originals'])),
+                ("Original Size:", f"{stats['original_size_mb']:.2f} MB"),
+                ("Storage Size:", f"{stats['storage_size_mb']:.2f} MB"),
+                ("Database File:", f"{stats['database_size_mb']:.2f} MB"),
+            ])
+    
+    def _show_stats(self, rows: List[tuple]):
+        """
+        Show statistics as name/value label pairs.
+        
+        Label pairs are created once and reused; only text that actually
+        changed is set, so a refresh with unchanged numbers does no work.
+        
+        Args:
+            rows: (name, value) pairs in display order
+        """
+        self.stats_label.hide()
+        for i, (name, value) in enumerate(rows):
+            if i == len(self._stat_rows):
+                name_label, value_label = QLabel(), QLabel()
+                bold = name_label.font()
+                bold.setBold(True)
+                name_label.setFont(bold)
+                self.stats_grid.addWidget(name_label, i, 0)
+                self.stats_grid.addWidget(value_label, i, 1)
+                self._stat_rows.append((name_label, value_label))
+            name_label, value_label = self._stat_rows[i]
+            if name_label.text() != name:
+                name_label.setText(name)
+            if value_label.text() != value:
+                value_label.setText(value)
+            name_label.show()
+            value_label.show()
+        for name_label, value_label in self._stat_rows[len(rows):]:
+            name_label.hide()
+            value_label.hide()
+    
+    def _show_stats_message(self, text: str):
+        """Replace the statistics with a status message."""
+        for name_label, value_label in self._stat_rows:
+            name_label.hide()
+            value_label.hide()
+        self.stats_label.setText(text)
+        self.stats_label.show()
     
     def _refresh_image_list(self):
         """Refresh the list of stored images."""
-        print("[DEBUG] _refresh_image_list() starting...")
+        logger.debug("_refresh_image_list() starting...")
         
         # Skip if database updates are disabled
         if self.skip_update:
-            print("[DEBUG] Skipping image list refresh (--skip-db-update is set)")
-            self.images_table.setRowCount(0)
-            self.stats_label.setText("<i>Database updates disabled (using --skip-db-update)</i>")
+            logger.debug("Skipping image list refresh (--skip-db-update is set)")
+            self._loader = None
+            self.images_model.clear()
+            self._last_fingerprint = None
+            self._show_stats_message("<i>Database updates disabled (using --skip-db-update)</i>")
             return
         
-        self.images_table.setRowCount(0)
-        print("[DEBUG] Table cleared")
-        
         storage = self._get_active_storage()
+        is_postgres = isinstance(storage, PostgresImageStorage)
+        
+        # Nothing to rebuild if the SQLite table is unchanged since the last fill
+        fingerprint = None
+        if not is_postgres:
+            fingerprint = storage.get_table_fingerprint()
+            if fingerprint == self._last_fingerprint:
+                self._refresh_stats()
+                return
+        self._last_fingerprint = fingerprint
         
         # Check if using PostgreSQL and not connected
-        if isinstance(storage, PostgresImageStorage) and not storage.is_connected():
-            self.stats_label.setText("<b>Backend:</b> PostgreSQL<br><b>Status:</b> Not connected")
+        if is_postgres and not storage.is_connected():
+            self._loader = None
+            self.images_model.clear()
+            self._show_stats_message("<b>Backend:</b> PostgreSQL<br><b>Status:</b> Not connected")
             return
 
-        print("[DEBUG] Calling get_all_metadata()...")
-        metadata_list = storage.get_all_metadata()
-        print(f"[DEBUG] Got {len(metadata_list)} metadata entries")
-
-        for i, metadata in enumerate(metadata_list):
-            print(f"[DEBUG] Processing image {i+1}/{len(metadata_list)}: {metadata.file_name}")
-            row = self.images_table.rowCount()
-            self.images_table.insertRow(row)
-
-            self.images_table.setItem(row, 0, QTableWidgetItem(metadata.file_name))
-            self.images_table.setItem(row, 1, QTableWidgetItem(metadata.dimensions))
+        # Read the list on a worker; the model is updated in _on_metadata_loaded.
+        # A loader still running from an earlier refresh is simply ignored.
+        self.table_group.setTitle("Stored Images (loading...)")
+        loader = MetadataLoader(storage, self)
+        loader.finished_with_data.connect(self._on_metadata_loaded)
+        loader.load_failed.connect(self._on_metadata_load_failed)
+        loader.finished.connect(loader.deleteLater)
+        self._loader = loader
+        loader.start()
 
-            size_mb = metadata.file_size / (1024 * 1024)
-            self.images_table.setItem(row, 2, QTableWidgetItem(f"{size_mb:.2f} MB"))
-
-            # For PostgreSQL, we don't have stored_at in metadata, so show N/A
-            stored_at = "N/A" if isinstance(storage, PostgresImageStorage) else "Unknown"
-            self.images_table.setItem(row, 3, QTableWidgetItem(str(stored_at)))
-
-            # For PostgreSQL, we don't track original_deleted
-            deleted = "N/A" if isinstance(storage, PostgresImageStorage) else "No"
-            self.images_table.setItem(row, 4, QTableWidgetItem(deleted))
-
-            # Store path in item data for later use
-            self.images_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, metadata.file_path)
-
-        print("[DEBUG] Calling _refresh_stats()...")
+        logger.debug("Calling _refresh_stats()...")
         self._refresh_stats()
-        print("[DEBUG] _refresh_image_list() complete")
+        logger.debug("_refresh_image_list() complete")
+    
+    def _on_metadata_loaded(self, rows: list):
+        """Show the row list read by the current MetadataLoader."""
+        loader = self.sender()
+        if loader is not self._loader:
+            return  # Superseded by a newer refresh
+        self._loader = None
+        self.table_group.setTitle("Stored Images")
+        # The model only holds rowids for SQLite; rows are fetched as they are painted.
+        # A diff may remove many row runs, so repaint once afterwards.
+        table = self.images_table
+        table.setUpdatesEnabled(False)
+        try:
+            self.images_model.set_rows(loader.storage, rows)
+        finally:
+            table.setUpdatesEnabled(True)
+        logger.debug("Listed %d stored images", self.images_model.rowCount())
+    
+    def _on_metadata_load_failed(self, error_msg: str):
+        """Report a failed list refresh."""
+        if self.sender() is not self._loader:
+            return
+        self._loader = None
+        self._last_fingerprint = None
+        self.table_group.setTitle("Stored Images")
+        logger.error("Failed to load stored images: %s", error_msg)
     
     def _import_folder(self):
         """Import images from a folder."""
@@ -426,65 +1124,54 @@ class ImageStorageDialog(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
         
-        # Show progress
+        # Show progress; the scan and store run on a worker thread
         progress = QProgressDialog("Importing images...", "Cancel", 0, count, self)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.setMinimumDuration(500)
+        # The scan and store phases each run up to the maximum; close explicitly when done
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        
+        self._import_progress = progress
+        self._import_thread = ImportThread(folder, storage, delete_originals)
+        self._import_thread.progress_update.connect(self._on_import_progress)
+        self._import_thread.import_failed.connect(self._on_import_failed)
+        self._import_thread.import_complete.connect(self._on_import_complete)
+        progress.canceled.connect(self._import_thread.cancel)
+        self.import_btn.setEnabled(False)
+        self._import_thread.start()
+    
+    def _on_import_progress(self, current: int, total: int, message: str):
+        """Update the import progress dialog."""
+        progress = self._import_progress
+        if progress.maximum() != total:
+            progress.setMaximum(total)
+        progress.setLabelText(message)
+        progress.setValue(current)
+    
+    def _on_import_failed(self, error_msg: str):
+        """Report an import error."""
+        self._import_progress.close()
+        self.import_btn.setEnabled(True)
         
-        imported = 0
-        failed = 0
-        
-        try:
-            def progress_callback(current, total):
-                progress.setValue(current)
-                return not progress.wasCanceled()
-            
-            scanner = ImageScanner(progress_callback=progress_callback)
-            images = scanner.scan_directory(folder)
-            
-            for i, metadata in enumerate(images):
-                if progress.wasCanceled():
-                    break
-                
-                progress.setLabelText(f"Importing {metadata.file_name}...")
-                
-                if isinstance(storage, PostgresImageStorage):
-                    # Use PostgreSQL storage
-                    result = storage.store_image_from_file(metadata.file_path, metadata)
-                    if result:
-                        imported += 1
-                    else:
-                        failed += 1
-                    # Note: PostgreSQL storage doesn't support delete_original in the same way
-                    if delete_originals and result:
-                        try:
-                            os.remove(metadata.file_path)
-                        except Exception as e:
-                            print(f"[WARNING] Failed to delete original: {e}")
-                else:
-                    # Use SQLite storage
-                    if storage.store_image_from_file(
-                        metadata.file_path, 
-                        metadata,
-                        delete_original=delete_originals
-                    ):
-                        imported += 1
-                    else:
-                        failed += 1
-                
-                progress.setValue(i + 1)
-        
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Import failed: {str(e)}")
+        QMessageBox.critical(self, "Error", f"Import failed: {error_msg}")
         
-        progress.close()
+        # Images stored before the error are kept, so the list may have changed
+        self._last_fingerprint = None
+        self._refresh_image_list()
+    
+    def _on_import_complete(self, imported: int, skipped: int, failed: int):
+        """Handle import completion."""
+        self._import_progress.close()
+        self.import_btn.setEnabled(True)
         
         QMessageBox.information(
             self,
             "Import Complete",
-            f"Imported: {imported}\nFailed: {failed}"
+            f"Imported: {imported}\nSkipped (already stored): {skipped}\nFailed: {failed}"
         )
         
+        self._last_fingerprint = None
         self._refresh_image_list()
     
     def _scan_for_cleanup(self):
@@ -503,8 +1190,28 @@ class ImageStorageDialog(QDialog):
             self.cleanup_btn.setEnabled(False)
             return
         
-        orphaned = storage.cleanup_deleted_originals(dry_run=True)
-        
+        # Listing the original folders can take a while; do it off the GUI thread
+        self.scan_cleanup_btn.setEnabled(False)
+        self.cleanup_btn.setEnabled(False)
+        self.cleanup_results.setText("Scanning...")
+        self._cleanup_thread = CleanupScanThread(storage.db_path)
+        self._cleanup_thread.progress_update.connect(self._on_cleanup_scan_progress)
+        self._cleanup_thread.scan_complete.connect(self._on_cleanup_scan_complete)
+        self._cleanup_thread.scan_failed.connect(self._on_cleanup_scan_failed)
+        self._cleanup_thread.start()
+    
+    def _on_cleanup_scan_progress(self, done: int, total: int):
+        """Show cleanup scan progress."""
+        self.cleanup_results.setText(f"Scanning... {done}/{total} folders")
+    
+    def _on_cleanup_scan_failed(self, error_msg: str):
+        """Report a failed cleanup scan."""
+        self.scan_cleanup_btn.setEnabled(True)
+        self.cleanup_results.setText(f"Scan failed: {error_msg}")
+    
+    def _on_cleanup_scan_complete(self, orphaned: list):
+        """Show the result of a cleanup scan."""
+        self.scan_cleanup_btn.setEnabled(True)
         if orphaned:
             self.cleanup_results.setText(f"Found {len(orphaned)} orphaned entries")
             self.cleanup_btn.setEnabled(True)
@@ -532,67 +1239,55 @@ class ImageStorageDialog(QDialog):
             QMessageBox.information(self, "Cleanup Complete", f"Removed {len(orphaned)} entries")
             self.cleanup_results.setText("")
             self.cleanup_btn.setEnabled(False)
+            self._last_fingerprint = None
             self._refresh_image_list()
     
     def _export_selected(self):
         """Export selected images to files."""
-        selected_rows = self.images_table.selectedIndexes()
-        if not selected_rows:
+        rows = [index.row() for index in self.images_table.selectionModel().selectedRows()]
+        if not rows:
             QMessageBox.information(self, "No Selection", "Please select images to export")
             return
         
         storage = self._get_active_storage()
         
-        # Get unique rows
-        rows = set(index.row() for index in selected_rows)
-        
         # Select destination folder
         dest_folder = QFileDialog.getExistingDirectory(self, "Select Export Folder")
         if not dest_folder:
             return
         
-        exported = 0
-        failed = 0
+        is_postgres = isinstance(storage, PostgresImageStorage)
+        model = self.images_model
+        # PostgreSQL exports by image ID, which the model already holds
+        key_of = model.row_db_id if is_postgres else model.row_path
+        selected = [(model.row_path(row), key_of(row), model.row_name(row)) for row in rows]
+        selected = [(key, name) for path, key, name in selected if path is not None]
         
-        for row in rows:
-            path_item = self.images_table.item(row, 0)
-            original_path = path_item.data(Qt.ItemDataRole.UserRole)
-            file_name = path_item.text()
-            
-            dest_path = f"{dest_folder}/{file_name}"
-            
-            if isinstance(storage, PostgresImageStorage):
-                # For PostgreSQL, we need to get image by path
-                # First get the metadata to find the ID
-                metadata_list = storage.get_all_metadata()
-                image_id = None
-                for meta in metadata_list:
-                    if meta.file_path == original_path:
-                        # Get ID from database - need to query by path
-                        import psycopg2
-                        from psycopg2.extras import RealDictCursor
-                        try:
-                            with storage.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                                cur.execute(
-                                    "SELECT id FROM stored_images WHERE original_path = %s",
-                                    (original_path,)
-                                )
-                                result = cur.fetchone()
-                                if result:
-                                    image_id = result['id']
-                        except Exception as e:
-                            print(f"[ERROR] Failed to get image ID: {e}")
-                        break
-                
-                if image_id and storage.export_image(image_id, dest_path):
-                    exported += 1
-                else:
-                    failed += 1
-            else:
-                if storage.export_image(original_path, dest_path):
-                    exported += 1
-                else:
-                    failed += 1
+        # QFileDialog returns '/'-separated paths; use native separators on every platform
+        dest_folder = os.path.normpath(dest_folder)
+        join = os.path.join
+        jobs = [(key, join(dest_folder, name)) for key, name in selected]
+        
+        # SQLite exports overlap BLOB reads and file writes across a pool;
+        # a single psycopg2 connection cannot, so PostgreSQL runs one at a time
+        max_workers = 1 if is_postgres else ExportThread.MAX_WORKERS
+        
+        progress = QProgressDialog("Exporting images...", "Cancel", 0, len(jobs), self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+        
+        self._export_progress = progress
+        self._export_thread = ExportThread(storage, jobs, max_workers)
+        self._export_thread.progress_update.connect(progress.setValue)
+        self._export_thread.export_complete.connect(self._on_export_complete)
+        progress.canceled.connect(self._export_thread.cancel)
+        self.export_btn.setEnabled(False)
+        self._export_thread.start()
+    
+    def _on_export_complete(self, exported: int, failed: int):
+        """Handle export completion."""
+        self._export_progress.close()
+        self.export_btn.setEnabled(True)
         
         QMessageBox.information(
             self,
@@ -613,14 +1308,11 @@ class ImageStorageDialog(QDialog):
         
         storage = self._get_active_storage()
         
-        selected_rows = self.images_table.selectedIndexes()
-        if not selected_rows:
+        rows = [index.row() for index in self.images_table.selectionModel().selectedRows()]
+        if not rows:
             QMessageBox.information(self, "No Selection", "Please select images to delete")
             return
         
-        # Get unique rows
-        rows = set(index.row() for index in selected_rows)
-        
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
@@ -629,26 +1321,13 @@ class ImageStorageDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            for row in rows:
-                path_item = self.images_table.item(row, 0)
-                original_path = path_item.data(Qt.ItemDataRole.UserRole)
-                
-                if isinstance(storage, PostgresImageStorage):
-                    # For PostgreSQL, need to find ID by path
-                    try:
-                        import psycopg2
-                        from psycopg2.extras import RealDictCursor
-                        with storage.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                            cur.execute(
-                                "SELECT id FROM stored_images WHERE original_path = %s",
-                                (original_path,)
-                            )
-                            result = cur.fetchone()
-                            if result:
-                                storage.delete_image(result['id'])
-                    except Exception as e:
-                        print(f"[ERROR] Failed to delete image: {e}")
-                else:
-                    storage.delete_image(original_path, delete_data=True)
+            if isinstance(storage, PostgresImageStorage):
+                # The model holds the image IDs; delete them in one transaction
+                storage.delete_images([self.images_model.row_db_id(row) for row in rows])
+            else:
+                paths = [path for path in map(self.images_model.row_path, rows) if path is not None]
+                # One transaction for the whole selection
+                storage.delete_images(paths, delete_data=True)
             
+            self._last_fingerprint = None
             self._refresh_image_list()
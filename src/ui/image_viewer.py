@@ -1,15 +1,203 @@
 """Image viewer widget for displaying images at full resolution."""
+import bisect
+import functools
+import io
 import os
 import subprocess
+from collections import OrderedDict
 from typing import Optional
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QScrollArea, QSizePolicy,
+    QApplication, QWidget, QVBoxLayout, QLabel, QScrollArea, QSizePolicy,
     QHBoxLayout, QPushButton, QComboBox
 )
-from PyQt6.QtCore import Qt, QSize, pyqtSignal
-from PyQt6.QtGui import QPixmap, QKeyEvent, QWheelEvent, QMouseEvent
+from PyQt6.QtCore import Qt, QSize, QRect, QPoint, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImage, QPainter, QKeyEvent, QWheelEvent, QMouseEvent
+from PIL import Image
 
-from ..utils.image_cache import ImageCache
+from ..utils.image_cache import ImageCache, system_memory_percent
+
+
+# Opens a file or folder with the desktop's default application; the
+# platform is resolved once at import
+if os.name == 'nt':  # Windows
+    _LAUNCH = os.startfile
+elif os.name == 'posix':  # Linux/macOS
+    # Popen with stdout/stderr redirected to suppress portal warnings
+    _XDG_OPEN = functools.partial(
+        subprocess.Popen,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    
+    def _LAUNCH(path: str):
+        _XDG_OPEN(['xdg-open', path])
+else:
+    _LAUNCH = None
+
+
+# One stylesheet for the viewer, parsed once at import and applied at the
+# widget root; children are matched by object name
+_VIEWER_QSS = """
+    QComboBox#zoomModeCombo {
+        background-color: #2a2a2a;
+        color: #eee;
+        border: 1px solid #444;
+        padding: 3px;
+        border-radius: 4px;
+        min-width: 120px;
+    }
+    QComboBox#zoomModeCombo::drop-down {
+        border: none;
+    }
+    QComboBox#zoomModeCombo QAbstractItemView {
+        background-color: #2a2a2a;
+        color: #eee;
+        selection-background-color: #4a9eff;
+    }
+    QPushButton#zoomOutBtn, QPushButton#zoomInBtn {
+        background-color: #3a3a3a;
+        color: #eee;
+        border: 1px solid #555;
+        border-radius: 4px;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QPushButton#zoomResetBtn, QPushButton#openImageBtn, QPushButton#openFolderBtn {
+        background-color: #3a3a3a;
+        color: #eee;
+        border: 1px solid #555;
+        padding: 3px 10px;
+        border-radius: 4px;
+    }
+    QPushButton#zoomOutBtn:hover, QPushButton#zoomInBtn:hover,
+    QPushButton#zoomResetBtn:hover {
+        background-color: #4a4a4a;
+    }
+    QPushButton#openImageBtn:hover, QPushButton#openFolderBtn:hover {
+        background-color: #4a9eff;
+    }
+    QScrollArea#imageScrollArea {
+        border: none;
+        background-color: #1a1a1a;
+    }
+    QLabel#imageLabel {
+        background-color: #1a1a1a;
+    }
+    QLabel#imageInfoLabel {
+        background-color: #2a2a2a;
+        color: #ccc;
+        padding: 5px;
+    }
+"""
+
+
+class DecodeSignals(QObject):
+    """Signals for decode tasks, which cannot emit signals themselves."""
+    
+    loaded = pyqtSignal(str, QImage)  # file_path, decoded image (null on failure)
+
+
+class DecodeTask(QRunnable):
+    """Thread pool task that decodes an image file off the GUI thread."""
+    
+    def __init__(self, file_path: str, signals: DecodeSignals):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = signals
+    
+    def run(self):
+        """Decode into a QImage; QPixmap may only be built on the GUI thread."""
+        image = QImage(self.file_path)
+        if image.isNull():
+            # Formats without a Qt image plugin (AVIF, JXL, ...) go through PIL,
+            # as ImageCache._load_image does
+            image = self._decode_with_pil()
+        if not image.isNull():
+            # Hand over one of the raster engine's native formats so scaling and
+            # painting never convert pixels on the GUI thread
+            target = (QImage.Format.Format_ARGB32_Premultiplied if image.hasAlphaChannel()
+                      else QImage.Format.Format_RGB32)
+            if image.format() != target:
+                image = image.convertToFormat(target)
+        self.signals.loaded.emit(self.file_path, image)
+    
+    def _decode_with_pil(self) -> QImage:
+        """Decode through PIL, returning a null QImage if that fails too."""
+        try:
+            with Image.open(self.file_path) as img:
+                has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+                img = img.convert('RGBA' if has_alpha else 'RGB')
+                data = io.BytesIO()
+                img.save(data, format='PNG')
+            return QImage.fromData(data.getvalue())
+        except Exception as e:
+            print(f"[ERROR] Error loading image {self.file_path}: {e}")
+            return QImage()
+
+
+class ScaledPixmapLabel(QLabel):
+    """Label that can also paint a pixmap scaled on the fly, without a scaled copy."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source: Optional[QPixmap] = None
+        self._display_size = QSize()
+        self._smooth = False
+    
+    def set_scaled_pixmap(self, pixmap: QPixmap, size: QSize, smooth: bool = False):
+        """
+        Show a pixmap painted at the given size.
+        
+        Args:
+            pixmap: Source pixmap, drawn scaled by the painter
+            size: Size to display it at
+            smooth: Whether to filter the pixmap (bilinear) while painting
+        """
+        super().clear()
+        self._source = pixmap
+        self._display_size = size
+        self._smooth = smooth
+        self.updateGeometry()
+        self.resize(size)
+        self.update()
+    
+    def setPixmap(self, pixmap: QPixmap):
+        self._source = None
+        super().setPixmap(pixmap)
+    
+    def setText(self, text: str):
+        self._source = None
+        super().setText(text)
+    
+    def clear(self):
+        self._source = None
+        super().clear()
+    
+    def sizeHint(self) -> QSize:
+        if self._source is not None:
+            return self._display_size
+        return super().sizeHint()
+    
+    def minimumSizeHint(self) -> QSize:
+        # A resizable scroll area only scrolls once the widget's minimum
+        # size exceeds the viewport
+        if self._source is not None:
+            return self._display_size
+        return super().minimumSizeHint()
+    
+    def paintEvent(self, event):
+        if self._source is None:
+            super().paintEvent(event)
+            return
+        
+        # Centered like the label's own pixmap; only the exposed area is drawn
+        target = QRect(QPoint(0, 0), self._display_size)
+        target.moveCenter(self.contentsRect().center())
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, self._smooth)
+        painter.drawPixmap(target, self._source)
+        painter.end()
 
 
 class ImageViewer(QWidget):
@@ -22,13 +210,81 @@ class ImageViewer(QWidget):
     ZOOM_ACTUAL = 'actual'
     ZOOM_CUSTOM = 'custom'
     
+    # Combo box text -> zoom mode, and zoom mode -> info label text
+    # (None means the current zoom percentage)
+    _MODE_MAP = {
+        'Fit to Window': ZOOM_FIT,
+        'Actual Size': ZOOM_ACTUAL,
+        'Custom': ZOOM_CUSTOM
+    }
+    _MODE_LABEL = {
+        ZOOM_FIT: "Fit",
+        ZOOM_ACTUAL: "100%",
+        ZOOM_CUSTOM: None
+    }
+    
+    # Custom zoom levels: 25% steps around 100%, bounded to 10%-500%, so
+    # zooming in and back out lands on exactly the same values
+    _ZOOM_STEPS = tuple(sorted({0.1, 5.0, *(1.25 ** i for i in range(-10, 8))}))
+    
+    # Number of scaled pixmaps kept for repeated zoom/viewport combinations
+    SCALED_CACHE_SIZE = 4
+    # Delay before a fast preview is replaced by the smooth rescale
+    SMOOTH_DELAY_MS = 120
+    # Delay used to coalesce resize events into one display update
+    RESIZE_DELAY_MS = 50
+    # Maximum number of neighbor images decoding in the background at once
+    MAX_PREFETCH = 2
+    # Images larger than this multiple of the viewport get a reduced master
+    # copy that fit and zoomed-out renders scale from
+    MASTER_VIEWPORT_FACTOR = 2
+    # Cached images are dropped when system memory use exceeds this percentage,
+    # then not again until use has fallen below the resume percentage
+    MEMORY_PURGE_PERCENT = 85
+    MEMORY_RESUME_PERCENT = 75
+    MEMORY_CHECK_INTERVAL_MS = 5000
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_pixmap: Optional[QPixmap] = None
         self.current_file_path: Optional[str] = None
+        self._display_master: Optional[QPixmap] = None
+        self._last_render_state: Optional[tuple] = None
+        # Viewport (width, height), re-read after each resize
+        self._cached_viewport: Optional[tuple] = None
         self.zoom_level = 1.0
         self.zoom_mode = self.ZOOM_FIT  # Default to fit
         self.image_cache = ImageCache(max_cache_size=10)
+        self._scaled_cache: OrderedDict = OrderedDict()
+        
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.timeout.connect(self._render_smooth)
+        
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._update_display)
+        
+        # Ctrl+wheel deltas collected until the event loop is idle again
+        self._wheel_accum = 0
+        self._wheel_timer = QTimer(self)
+        self._wheel_timer.setSingleShot(True)
+        self._wheel_timer.timeout.connect(self._apply_wheel_zoom)
+        
+        self._pending_decodes: set = set()
+        self._decode_signals = DecodeSignals(self)
+        self._decode_signals.loaded.connect(self._on_decoded)
+        
+        # Memory pressure is only sampled where the platform exposes it
+        self._memory_purged = False  # Purged for the current high-memory episode
+        self._memory_timer = QTimer(self)
+        self._memory_timer.timeout.connect(self._check_memory)
+        if system_memory_percent() is not None:
+            self._memory_timer.start(self.MEMORY_CHECK_INTERVAL_MS)
+        
+        app = QApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_application_state_changed)
         
         self._setup_ui()
     
@@ -46,143 +302,60 @@ class ImageViewer(QWidget):
         # Zoom mode selector
         zoom_layout.addWidget(QLabel("Zoom:"))
         self.zoom_mode_combo = QComboBox()
+        self.zoom_mode_combo.setObjectName("zoomModeCombo")
         self.zoom_mode_combo.addItems(['Fit to Window', 'Actual Size', 'Custom'])
         self.zoom_mode_combo.setCurrentText('Fit to Window')
         self.zoom_mode_combo.currentTextChanged.connect(self._on_zoom_mode_changed)
-        self.zoom_mode_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #2a2a2a;
-                color: #eee;
-                border: 1px solid #444;
-                padding: 3px;
-                border-radius: 4px;
-                min-width: 120px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2a2a2a;
-                color: #eee;
-                selection-background-color: #4a9eff;
-            }
-        """)
         zoom_layout.addWidget(self.zoom_mode_combo)
         
         # Zoom buttons (for custom mode)
         self.zoom_out_btn = QPushButton("−")
+        self.zoom_out_btn.setObjectName("zoomOutBtn")
         self.zoom_out_btn.setFixedSize(28, 28)
         self.zoom_out_btn.setToolTip("Zoom out")
         self.zoom_out_btn.clicked.connect(self.zoom_out)
-        self.zoom_out_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         zoom_layout.addWidget(self.zoom_out_btn)
         
         self.zoom_in_btn = QPushButton("+")
+        self.zoom_in_btn.setObjectName("zoomInBtn")
         self.zoom_in_btn.setFixedSize(28, 28)
         self.zoom_in_btn.setToolTip("Zoom in")
         self.zoom_in_btn.clicked.connect(self.zoom_in)
-        self.zoom_in_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         zoom_layout.addWidget(self.zoom_in_btn)
         
         self.zoom_reset_btn = QPushButton("Reset")
+        self.zoom_reset_btn.setObjectName("zoomResetBtn")
         self.zoom_reset_btn.setToolTip("Reset zoom to fit")
         self.zoom_reset_btn.clicked.connect(self.reset_zoom)
-        self.zoom_reset_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                padding: 3px 10px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         zoom_layout.addWidget(self.zoom_reset_btn)
         
         zoom_layout.addStretch()
         
         # Open file/folder buttons
         self.open_image_btn = QPushButton("📄 Open Image")
+        self.open_image_btn.setObjectName("openImageBtn")
         self.open_image_btn.setToolTip("Open image file in default application")
         self.open_image_btn.clicked.connect(self._open_image_file)
-        self.open_image_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                padding: 3px 10px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a9eff;
-            }
-        """)
         zoom_layout.addWidget(self.open_image_btn)
         
         self.open_folder_btn = QPushButton("📁 Open Folder")
+        self.open_folder_btn.setObjectName("openFolderBtn")
         self.open_folder_btn.setToolTip("Open containing folder in file manager")
         self.open_folder_btn.clicked.connect(self._open_containing_folder)
-        self.open_folder_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #eee;
-                border: 1px solid #555;
-                padding: 3px 10px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a9eff;
-            }
-        """)
         zoom_layout.addWidget(self.open_folder_btn)
         
         layout.addWidget(zoom_toolbar)
         
         # Scroll area for image
         self.scroll_area = QScrollArea()
+        self.scroll_area.setObjectName("imageScrollArea")
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #1a1a1a;
-            }
-        """)
         
         # Image label
-        self.image_label = QLabel()
+        self.image_label = ScaledPixmapLabel()
+        self.image_label.setObjectName("imageLabel")
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: #1a1a1a;
-            }
-        """)
         self.image_label.setSizePolicy(
             QSizePolicy.Policy.Expanding,
             QSizePolicy.Policy.Expanding
@@ -193,100 +366,327 @@ class ImageViewer(QWidget):
         
         # Info label
         self.info_label = QLabel("No image loaded")
+        self.info_label.setObjectName("imageInfoLabel")
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_label.setStyleSheet("""
-            QLabel {
-                background-color: #2a2a2a;
-                color: #ccc;
-                padding: 5px;
-            }
-        """)
         layout.addWidget(self.info_label)
         
+        self.setStyleSheet(_VIEWER_QSS)
+        
         # Set focus policy for keyboard events
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        
+        # Zoom mode -> target size method, looked up once per display update
+        self._mode_handlers = {
+            self.ZOOM_FIT: self._fit_target,
+            self.ZOOM_ACTUAL: self._actual_target,
+            self.ZOOM_CUSTOM: self._custom_target
+        }
     
     def load_image(self, file_path: str):
         """
         Load and display an image.
         
+        Cached images are shown immediately; otherwise the file is decoded
+        on the thread pool and shown once it arrives, unless another image
+        was requested in the meantime.
+        
         Args:
             file_path: Path to the image file
         """
         self.current_file_path = file_path
+        self._last_render_state = None
+        self._scaled_cache.clear()
+        self._smooth_timer.stop()
         
-        # Try to get from cache first
-        pixmap = self.image_cache.get(file_path)
-        
-        if not pixmap:
-            # Load directly
-            pixmap = QPixmap(file_path)
-            if not pixmap.isNull():
-                self.image_cache.get(file_path)  # Add to cache
+        if self.image_cache.contains(file_path):
+            self._show_pixmap(self.image_cache.get(file_path))
+            return
         
+        self.current_pixmap = None
+        self._display_master = None
+        self.info_label.setText("Loading...")
+        self._decode(file_path)
+    
+    def _show_pixmap(self, pixmap: Optional[QPixmap]):
+        """Make a loaded pixmap the current image, or report a load failure."""
         if pixmap and not pixmap.isNull():
             self.current_pixmap = pixmap
-            self._update_display()
+            self._display_master = self._make_display_master(pixmap)
+            self._render_smooth()
             self._update_info()
         else:
             self.current_pixmap = None
+            self._display_master = None
             self.image_label.setText("Failed to load image")
             self.info_label.setText("Error loading image")
     
+    def _make_display_master(self, pixmap: QPixmap) -> Optional[QPixmap]:
+        """
+        Downscale a large image once so later renders touch fewer pixels.
+        
+        Args:
+            pixmap: Full resolution image
+            
+        Returns:
+            Reduced copy, or None if the image is already small enough
+        """
+        viewport_size = self.scroll_area.viewport().size()
+        master_max = max(viewport_size.width(), viewport_size.height()) * self.MASTER_VIEWPORT_FACTOR
+        if pixmap.width() <= master_max and pixmap.height() <= master_max:
+            return None
+        return pixmap.scaled(
+            master_max,
+            master_max,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+    
+    def _scale_source(self, target: QSize) -> QPixmap:
+        """Return the smallest available pixmap that still covers the target size."""
+        master = self._display_master
+        if master and target.width() <= master.width() and target.height() <= master.height():
+            return master
+        return self.current_pixmap
+    
+    def _decode(self, file_path: str):
+        """Start a background decode unless one is already in flight."""
+        if file_path in self._pending_decodes:
+            return
+        self._pending_decodes.add(file_path)
+        QThreadPool.globalInstance().start(DecodeTask(file_path, self._decode_signals))
+    
+    def set_neighbors(self, prev_path: Optional[str], next_path: Optional[str]):
+        """
+        Decode the images around the current one in the background.
+        
+        Args:
+            prev_path: Path of the previous image, if any
+            next_path: Path of the next image, if any
+        """
+        self._prefetch([path for path in (next_path, prev_path) if path])
+    
+    def _prefetch(self, paths: list):
+        """Start background decodes for paths not yet cached or in flight."""
+        for path in paths:
+            # The current image's decode does not count against the limit
+            if len(self._pending_decodes - {self.current_file_path}) >= self.MAX_PREFETCH:
+                break
+            if not self.image_cache.contains(path):
+                self._decode(path)
+    
+    def _on_decoded(self, file_path: str, image: QImage):
+        """Convert a decoded image on the GUI thread, cache it and show it if current."""
+        self._pending_decodes.discard(file_path)
+        pixmap = None
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self.image_cache.put(file_path, pixmap)
+        
+        if file_path == self.current_file_path and self.current_pixmap is None:
+            self._show_pixmap(pixmap)
+    
+    def _check_memory(self):
+        """Drop cached images when the system is running low on memory."""
+        percent = system_memory_percent()
+        if percent is None:
+            return
+        if percent < self.MEMORY_RESUME_PERCENT:
+            self._memory_purged = False
+        elif percent > self.MEMORY_PURGE_PERCENT and not self._memory_purged:
+            # Purge once per episode; the pressure may come from other
+            # processes, and emptying the cache every check would defeat it
+            self._memory_purged = True
+            self._purge_caches()
+    
+    def _on_application_state_changed(self, state: Qt.ApplicationState):
+        """Release cached images when the application is suspended or hidden."""
+        if state in (Qt.ApplicationState.ApplicationSuspended, Qt.ApplicationState.ApplicationHidden):
+            self._purge_caches()
+    
+    def _purge_caches(self):
+        """Release cached pixmaps; the image on screen stays loaded."""
+        if not self.image_cache.get_stats()['cached_images'] and not self._scaled_cache:
+            return
+        released = self.image_cache.purge()
+        self._scaled_cache.clear()
+        self._last_render_state = None
+        if released:
+            print(f"[DEBUG] Released {released / (1024 * 1024):.1f} MB of cached images")
+    
     def _update_display(self):
-        """Update the displayed image with current zoom mode."""
+        """
+        Update the displayed image with current zoom mode.
+        
+        Shows a fast-scaled pixmap immediately and schedules the smooth
+        version, so bursts of zoom or resize events only pay for one
+        smooth rescale once they settle.
+        """
         if not self.current_pixmap:
             return
         
-        # Get available size with some padding
-        viewport_size = self.scroll_area.viewport().size()
-        available_width = max(viewport_size.width() - 40, 100)
-        available_height = max(viewport_size.height() - 40, 100)
-        
-        if self.zoom_mode == self.ZOOM_FIT:
-            # Fit to window
-            scaled = self.current_pixmap.scaled(
-                available_width,
-                available_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.zoom_level = scaled.width() / self.current_pixmap.width()
-        elif self.zoom_mode == self.ZOOM_ACTUAL:
-            # Actual size (100%)
-            self.zoom_level = 1.0
+        # Nothing to do if the image, zoom and viewport match the last render
+        if self._render_key(*self._available_size()) == self._last_render_state:
+            return
+        
+        if self._render(Qt.TransformationMode.FastTransformation):
+            self._smooth_timer.start(self.SMOOTH_DELAY_MS)
+        else:
+            self._smooth_timer.stop()
+    
+    def _render_smooth(self):
+        """Replace the displayed pixmap with a smooth-scaled version."""
+        if self.current_pixmap:
+            self._render(Qt.TransformationMode.SmoothTransformation)
+    
+    def _available_size(self) -> tuple:
+        """Return the (width, height) available for the image, with padding."""
+        if self._cached_viewport is None:
+            viewport_size = self.scroll_area.viewport().size()
+            self._cached_viewport = (viewport_size.width(), viewport_size.height())
+        viewport_width, viewport_height = self._cached_viewport
+        return (
+            max(viewport_width - 40, 100),
+            max(viewport_height - 40, 100)
+        )
+    
+    def _render_key(self, available_width: int, available_height: int) -> tuple:
+        """Identify a render by image, zoom and available size."""
+        # Fit mode derives zoom_level from the result, so only custom zoom
+        # contributes the current level to the key
+        return (
+            self.current_file_path,
+            round(self.zoom_level, 3) if self.zoom_mode == self.ZOOM_CUSTOM else None,
+            available_width,
+            available_height,
+            self.zoom_mode
+        )
+    
+    def _render(self, transformation: Qt.TransformationMode) -> bool:
+        """
+        Scale the current pixmap for the current zoom mode and show it.
+        
+        A fast render only paints the source scaled on screen; the smooth
+        render produces the scaled pixmap and caches it.
+        
+        Args:
+            transformation: Transformation mode used when scaling is needed
+            
+        Returns:
+            True if a fast preview was shown that still needs a smooth pass
+        """
+        available_width, available_height = self._available_size()
+        key = self._render_key(available_width, available_height)
+        self._last_render_state = key
+        
+        scaled = self._scaled_cache.get(key)
+        if scaled is not None:
+            self._scaled_cache.move_to_end(key)
+            if self.zoom_mode == self.ZOOM_FIT:
+                self.zoom_level = scaled.width() / self.current_pixmap.width()
+            elif self.zoom_mode == self.ZOOM_ACTUAL:
+                self.zoom_level = 1.0
+            self.image_label.setPixmap(scaled)
+            self.image_label.resize(scaled.size())
+            return False
+        
+        handler = self._mode_handlers.get(self.zoom_mode, self._custom_target)
+        target = handler(available_width, available_height)
+        
+        if target == self.current_pixmap.size():
             scaled = self.current_pixmap
+        elif self.zoom_mode == self.ZOOM_CUSTOM and self.zoom_level > 1.0:
+            # Enlarging needs no real filtering, so let the painter stretch the
+            # original instead of allocating a larger pixmap
+            self.image_label.set_scaled_pixmap(self.current_pixmap, target, smooth=True)
+            return False
+        elif transformation == Qt.TransformationMode.FastTransformation:
+            # Let the painter scale the existing pixels for the preview
+            # instead of materializing another buffer
+            self.image_label.set_scaled_pixmap(self._scale_source(target), target)
+            return True
         else:
-            # Custom zoom
-            new_size = QSize(
-                int(self.current_pixmap.width() * self.zoom_level),
-                int(self.current_pixmap.height() * self.zoom_level)
-            )
-            scaled = self.current_pixmap.scaled(
-                new_size,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
+            scaled = self._smooth_scale(self._scale_source(target), target)
+        
+        self._scaled_cache[key] = scaled
+        if len(self._scaled_cache) > self.SCALED_CACHE_SIZE:
+            self._scaled_cache.popitem(last=False)
         
         self.image_label.setPixmap(scaled)
         self.image_label.resize(scaled.size())
+        return False
+    
+    @staticmethod
+    def _smooth_scale(source: QPixmap, target: QSize) -> QPixmap:
+        """Smooth-scale a pixmap to a target size with the same aspect ratio."""
+        # The limiting side is known from the aspect ratios, so scale to it
+        # directly instead of having Qt work out the fit
+        if target.width() * source.height() <= target.height() * source.width():
+            return source.scaledToWidth(target.width(), Qt.TransformationMode.SmoothTransformation)
+        return source.scaledToHeight(target.height(), Qt.TransformationMode.SmoothTransformation)
+    
+    def _fit_target(self, available_width: int, available_height: int) -> QSize:
+        """Size the image to fit the available area."""
+        width = self.current_pixmap.width()
+        height = self.current_pixmap.height()
+        if width * available_height > available_width * height:
+            target = QSize(available_width, max(1, round(height * available_width / width)))
+        else:
+            target = QSize(max(1, round(width * available_height / height)), available_height)
+        self.zoom_level = target.width() / width
+        return target
+    
+    def _actual_target(self, available_width: int, available_height: int) -> QSize:
+        """Size the image at actual size (100%)."""
+        self.zoom_level = 1.0
+        return self.current_pixmap.size()
+    
+    def _custom_target(self, available_width: int, available_height: int) -> QSize:
+        """Size the image by the current custom zoom level."""
+        # Repeated zoom steps drift around 1.0; treat that as actual size so
+        # the unscaled pixmap is shown instead of an identical resample
+        if abs(self.zoom_level - 1.0) < 1e-3:
+            self.zoom_level = 1.0
+            return self.current_pixmap.size()
+        return QSize(
+            max(1, int(self.current_pixmap.width() * self.zoom_level)),
+            max(1, int(self.current_pixmap.height() * self.zoom_level))
+        )
     
     def zoom_in(self):
-        """Zoom in by 25%."""
+        """Zoom in by one 25% step."""
         self.zoom_mode = self.ZOOM_CUSTOM
         self.zoom_mode_combo.setCurrentText('Custom')
-        self.zoom_level = min(self.zoom_level * 1.25, 5.0)
+        self.zoom_level = self._step_zoom(self.zoom_level, 1)
         self._update_display()
         self._update_info()
     
     def zoom_out(self):
-        """Zoom out by 25%."""
+        """Zoom out by one 25% step."""
         self.zoom_mode = self.ZOOM_CUSTOM
         self.zoom_mode_combo.setCurrentText('Custom')
-        self.zoom_level = max(self.zoom_level / 1.25, 0.1)
+        self.zoom_level = self._step_zoom(self.zoom_level, -1)
         self._update_display()
         self._update_info()
     
+    @classmethod
+    def _step_zoom(cls, level: float, steps: int) -> float:
+        """
+        Move a zoom level along the zoom ladder.
+        
+        Args:
+            level: Current zoom level, which may lie between steps (e.g. after fit)
+            steps: Number of steps to zoom in (positive) or out (negative)
+            
+        Returns:
+            The resulting zoom level from _ZOOM_STEPS
+        """
+        ladder = cls._ZOOM_STEPS
+        if steps > 0:
+            index = bisect.bisect_right(ladder, level + 1e-6) + steps - 1
+        else:
+            index = bisect.bisect_left(ladder, level - 1e-6) + steps
+        return ladder[min(max(index, 0), len(ladder) - 1)]
+    
     def reset_zoom(self):
         """Reset zoom to fit window."""
         self.zoom_mode = self.ZOOM_FIT
@@ -296,12 +696,7 @@ class ImageViewer(QWidget):
     
     def _on_zoom_mode_changed(self, mode_text: str):
         """Handle zoom mode selection change."""
-        mode_map = {
-            'Fit to Window': self.ZOOM_FIT,
-            'Actual Size': self.ZOOM_ACTUAL,
-            'Custom': self.ZOOM_CUSTOM
-        }
-        self.zoom_mode = mode_map.get(mode_text, self.ZOOM_FIT)
+        self.zoom_mode = self._MODE_MAP.get(mode_text, self.ZOOM_FIT)
         
         if self.zoom_mode == self.ZOOM_ACTUAL:
             self.zoom_level = 1.0
@@ -315,11 +710,7 @@ class ImageViewer(QWidget):
     def _update_info(self):
         """Update the info label."""
         if self.current_pixmap:
-            mode_text = {
-                self.ZOOM_FIT: "Fit",
-                self.ZOOM_ACTUAL: "100%",
-                self.ZOOM_CUSTOM: f"{int(self.zoom_level * 100)}%"
-            }.get(self.zoom_mode, f"{int(self.zoom_level * 100)}%")
+            mode_text = self._MODE_LABEL.get(self.zoom_mode) or f"{int(self.zoom_level * 100)}%"
             
             self.info_label.setText(
                 f"{self.current_pixmap.width()}x{self.current_pixmap.height()} | "
@@ -329,25 +720,44 @@ class ImageViewer(QWidget):
     def wheelEvent(self, event: QWheelEvent):
         """Handle mouse wheel for zooming."""
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-            delta = event.angleDelta().y()
-            if delta > 0:
-                self.zoom_in()
-            else:
-                self.zoom_out()
+            self._wheel_accum += event.angleDelta().y()
+            self._wheel_timer.start(0)
             event.accept()
         else:
             super().wheelEvent(event)
     
+    def _apply_wheel_zoom(self):
+        """Apply the accumulated wheel deltas as a single zoom change."""
+        # One 25% step per full notch (120); partial notches carry over
+        steps = int(self._wheel_accum / 120)
+        self._wheel_accum -= steps * 120
+        if not steps:
+            return
+        
+        self.zoom_level = self._step_zoom(self.zoom_level, steps)
+        self.zoom_mode = self.ZOOM_CUSTOM
+        self.zoom_mode_combo.setCurrentText('Custom')
+        self._update_display()
+        self._update_info()
+    
     def resizeEvent(self, event):
         """Handle resize to update image display."""
         super().resizeEvent(event)
+        # The scroll area may not have laid out its viewport yet, so only
+        # invalidate here and read the size on the next render
+        self._cached_viewport = None
         if self.current_pixmap and self.zoom_mode == self.ZOOM_FIT:
-            self._update_display()
+            self._resize_timer.start(self.RESIZE_DELAY_MS)
     
     def clear(self):
         """Clear the current image."""
         self.current_pixmap = None
         self.current_file_path = None
+        self._last_render_state = None
+        self._display_master = None
+        self._scaled_cache.clear()
+        self._smooth_timer.stop()
+        self._resize_timer.stop()
         self.image_label.clear()
         self.info_label.setText("No image loaded")
     
@@ -355,16 +765,8 @@ class ImageViewer(QWidget):
         """Open the current image file in the default application."""
         if self.current_file_path and os.path.exists(self.current_file_path):
             try:
-                if os.name == 'nt':  # Windows
-                    os.startfile(self.current_file_path)
-                elif os.name == 'posix':  # Linux/macOS
-                    # Use Popen with stdout/stderr redirected to suppress portal warnings
-                    subprocess.Popen(
-                        ['xdg-open', self.current_file_path],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        start_new_session=True
-                    )
+                if _LAUNCH is not None:
+                    _LAUNCH(self.current_file_path)
             except Exception as e:
                 print(f"[ERROR] Failed to open image file: {e}")
         else:
@@ -376,16 +778,8 @@ class ImageViewer(QWidget):
             folder_path = os.path.dirname(self.current_file_path)
             if os.path.exists(folder_path):
                 try:
-                    if os.name == 'nt':  # Windows
-                        os.startfile(folder_path)
-                    elif os.name == 'posix':  # Linux/macOS
-                        # Use Popen with stdout/stderr redirected to suppress portal warnings
-                        subprocess.Popen(
-                            ['xdg-open', folder_path],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                            start_new_session=True
-                        )
+                    if _LAUNCH is not None:
+                        _LAUNCH(folder_path)
                 except Exception as e:
                     print(f"[ERROR] Failed to open folder: {e}")
         else:
@@ -1,7 +1,8 @@
 """Main application window."""
 import os
 import json
-from typing import List, Optional
+import logging
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
@@ -10,7 +11,7 @@ from PyQt6.QtWidgets import (
     QMenuBar, QMenu, QToolBar, QStatusBar, QLabel, QProgressBar, QTabWidget,
     QPushButton
 )
-from PyQt6.QtCore import Qt, QSettings, QTimer
+from PyQt6.QtCore import Qt, QSettings, QSignalBlocker, QTimer, pyqtSlot
 from PyQt6.QtGui import QAction, QKeySequence, QShortcut
 
 from ..core.image_scanner import ImageScanner
@@ -21,7 +22,7 @@ from ..models.image_data import ImageMetadata
 from .paginated_thumbnail_grid import PaginatedThumbnailGrid
 from .image_viewer import ImageViewer
 from .metadata_panel import MetadataPanel
-from .filter_bar import FilterBar
+from .filter_bar import FilterBar, FilterState
 from .slideshow_dialog import SlideshowDialog
 from .image_storage_dialog import ImageStorageDialog
 from .folder_loader import FolderLoaderThread
@@ -29,6 +30,8 @@ from .filesystem_browser import FilesystemBrowser
 from .settings_dialog import SettingsDialog
 from .collections_panel import CollectionsPanel
 
+logger = logging.getLogger(__name__)
+
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -47,6 +50,7 @@ class MainWindow(QMainWindow):
         self.metadata_cache = MetadataCache()
         self.current_folder: Optional[str] = None
         self.filtered_images: List[ImageMetadata] = []
+        self._path_to_index: Dict[str, int] = {}  # file_path -> index in filtered_images
         self.current_image_index: int = -1
         self.fullscreen_viewer: Optional[ImageViewer] = None
         self.slideshow_dialog: Optional[SlideshowDialog] = None
@@ -59,7 +63,8 @@ class MainWindow(QMainWindow):
         
         # Load settings
         self.settings = QSettings("SDImageViewer", "Settings")
-        self.use_metadata_cache = self.settings.value("use_metadata_cache", False, type=bool)
+        self._settings_cache: Dict[str, Any] = {}
+        self.use_metadata_cache = self._get_setting("use_metadata_cache", False, bool)
         
         self._setup_ui()
         self._setup_menu()
@@ -106,7 +111,6 @@ class MainWindow(QMainWindow):
         self.filesystem_browser = FilesystemBrowser()
         self.filesystem_browser.folder_selected.connect(self._on_filesystem_folder_selected)
         self.filesystem_browser.file_selected.connect(self._on_filesystem_file_selected)
-        self.filesystem_browser.file_selected.connect(self._on_filesystem_file_selected)
         self.left_tabs.addTab(self.filesystem_browser, "📁 Browse")
         
         # Collections tab
@@ -391,18 +395,51 @@ class MainWindow(QMainWindow):
         # Escape to exit fullscreen
         QShortcut(QKeySequence("Escape"), self, self._exit_fullscreen)
     
+    def _get_setting(self, key: str, default: Any = None, value_type: Optional[type] = None) -> Any:
+        """
+        Read a setting, hitting QSettings only on the first access.
+        
+        Args:
+            key: Settings key
+            default: Value returned when the key is not set
+            value_type: Optional type QSettings should convert the value to
+            
+        Returns:
+            The setting's value
+        """
+        if key not in self._settings_cache:
+            if value_type is None:
+                self._settings_cache[key] = self.settings.value(key, default)
+            else:
+                self._settings_cache[key] = self.settings.value(key, default, type=value_type)
+        return self._settings_cache[key]
+    
+    def _set_setting(self, key: str, value: Any):
+        """
+        Update a setting, writing to QSettings only when the value changed.
+        
+        Args:
+            key: Settings key
+            value: New value
+        """
+        if key in self._settings_cache and self._settings_cache[key] == value:
+            return
+        self._settings_cache[key] = value
+        self.settings.setValue(key, value)
+    
     def _load_last_folder(self):
         """Load the last opened folder from settings."""
-        last_folder = self.settings.value("last_folder", "")
+        last_folder = self._get_setting("last_folder", "")
         if last_folder and os.path.exists(last_folder):
             self._load_folder(last_folder, recursive=True)
     
+    @pyqtSlot()
     def _open_folder(self):
         """Open a folder dialog and load images."""
         folder = QFileDialog.getExistingDirectory(
             self,
             "Select Image Folder",
-            self.settings.value("last_folder", "")
+            self._get_setting("last_folder", "")
         )
         
         if folder:
@@ -410,14 +447,15 @@ class MainWindow(QMainWindow):
     
     def _load_folder(self, folder: str, recursive: bool = True):
         """Load images from a folder asynchronously."""
-        print(f"[DEBUG] Starting to load folder: {folder} (recursive={recursive})")
+        logger.debug("Starting to load folder: %s (recursive=%s)", folder, recursive)
         self.current_folder = folder
-        self.settings.setValue("last_folder", folder)
+        self._set_setting("last_folder", folder)
         
         # Clear existing index
-        print("[DEBUG] Clearing existing index...")
+        logger.debug("Clearing existing index...")
         self.image_index.clear()
         self.filtered_images = []
+        self._path_to_index = {}
         self.current_image_index = -1
         self.thumbnail_grid.set_images([])  # Clear thumbnails
         
@@ -447,6 +485,7 @@ class MainWindow(QMainWindow):
         # Start loading
         self.loader_thread.start()
     
+    @pyqtSlot(int, int, str)
     def _on_loading_progress(self, current: int, total: int, message: str):
         """Handle loading progress updates."""
         self.status_bar.showMessage(message)
@@ -457,20 +496,21 @@ class MainWindow(QMainWindow):
         else:
             self.loading_progress_bar.setRange(0, 0)  # Indeterminate
     
+    @pyqtSlot(list)
     def _on_loading_complete(self, images: List[ImageMetadata]):
         """Handle successful loading completion."""
-        print(f"[DEBUG] Loading complete, got {len(images)} images")
+        logger.debug("Loading complete, got %d images", len(images))
         
         # Hide loading indicator
         self.loading_progress_bar.setVisible(False)
         
         # Add images to index
-        print("[DEBUG] Adding images to index...")
+        logger.debug("Adding images to index...")
         added_count = self.image_index.add_images(images)
-        print(f"[DEBUG] Added {added_count} images to index")
+        logger.debug("Added %d images to index", added_count)
         
         # Apply filters and update UI
-        print("[DEBUG] Applying filters...")
+        logger.debug("Applying filters...")
         self._apply_filters()
         
         # Update filesystem browser to show current folder
@@ -484,11 +524,12 @@ class MainWindow(QMainWindow):
             f"Loaded {len(images)} images{cache_status}{skip_status} from {self.current_folder}",
             5000
         )
-        print("[DEBUG] Load complete")
+        logger.debug("Load complete")
     
+    @pyqtSlot(str)
     def _on_loading_failed(self, error_msg: str):
         """Handle loading failure."""
-        print(f"[ERROR] Loading failed: {error_msg}")
+        logger.error("Loading failed: %s", error_msg)
         
         # Hide loading indicator
         self.loading_progress_bar.setVisible(False)
@@ -501,16 +542,18 @@ class MainWindow(QMainWindow):
             f"Failed to load images:\n{error_msg}"
         )
     
+    @pyqtSlot(bool)
     def _toggle_metadata_cache(self, enabled: bool):
         """Toggle metadata caching on/off."""
         self.use_metadata_cache = enabled
-        self.settings.setValue("use_metadata_cache", enabled)
+        self._set_setting("use_metadata_cache", enabled)
         self.cache_action.setChecked(enabled)
         
         status = "enabled" if enabled else "disabled"
         self.status_bar.showMessage(f"Metadata cache {status}", 3000)
-        print(f"[DEBUG] Metadata cache {status}")
+        logger.debug("Metadata cache %s", status)
     
+    @pyqtSlot()
     def _clear_metadata_cache(self):
         """Clear all metadata caches."""
         reply = QMessageBox.question(
@@ -527,11 +570,13 @@ class MainWindow(QMainWindow):
             else:
                 self.status_bar.showMessage("Failed to clear cache", 3000)
     
+    @pyqtSlot()
     def _show_storage_manager(self):
         """Show the image storage manager dialog."""
         dialog = ImageStorageDialog(self, skip_update=self.skip_db_update)
         dialog.exec()
     
+    @pyqtSlot()
     def _show_settings(self):
         """Show the settings dialog."""
         dialog = SettingsDialog(self)
@@ -539,6 +584,7 @@ class MainWindow(QMainWindow):
             # Settings were saved, show confirmation
             self.status_bar.showMessage("Settings saved", 3000)
     
+    @pyqtSlot()
     def _refresh_current_metadata(self):
         """Refresh metadata for currently loaded images."""
         if not self.current_folder or not self.filtered_images:
@@ -599,6 +645,7 @@ class MainWindow(QMainWindow):
                 f"Refreshed metadata for {refreshed} images."
             )
     
+    @pyqtSlot()
     def _refresh_all_metadata(self):
         """Refresh metadata for all images in the database."""
         reply = QMessageBox.question(
@@ -658,6 +705,7 @@ class MainWindow(QMainWindow):
                 f"Refreshed metadata for {refreshed} images."
             )
 
+    @pyqtSlot()
     def _rescan_new_files(self):
         """Rescan for new files in the current folder."""
         if not self.current_folder:
@@ -736,6 +784,7 @@ class MainWindow(QMainWindow):
                 f"Added {len(new_files)} new images."
             )
 
+    @pyqtSlot()
     def _rescan_all_files(self):
         """Rescan all files in the current folder, flushing all metadata."""
         if not self.current_folder:
@@ -811,18 +860,32 @@ class MainWindow(QMainWindow):
                 f"Rescanned {len(all_images)} images."
             )
 
-    def _apply_filters(self):
-        """Apply current filter and sort settings."""
-        print("[DEBUG] Applying filters...")
-        include_terms = self.filter_bar.get_include_terms()
-        exclude_terms = self.filter_bar.get_exclude_terms()
+    @pyqtSlot()
+    @pyqtSlot(object)
+    def _apply_filters(self, state: Optional[FilterState] = None):
+        """
+        Apply current filter and sort settings.
+        
+        Args:
+            state: Snapshot emitted with filter_changed; read from the filter
+                bar's getters when None (sort changes, direct calls)
+        """
+        logger.debug("Applying filters...")
+        if state is not None:
+            include_terms = list(state.include)
+            exclude_terms = list(state.exclude)
+            orientation = {'portrait': state.portrait, 'landscape': state.landscape,
+                           'square': state.square}
+        else:
+            include_terms = self.filter_bar.get_include_terms()
+            exclude_terms = self.filter_bar.get_exclude_terms()
+            orientation = self.filter_bar.get_orientation_filters()
         sort_by = self.filter_bar.get_sort_by()
         reverse = self.filter_bar.get_reverse_sort()
-        orientation = self.filter_bar.get_orientation_filters()
-        print(f"[DEBUG] Include terms: {include_terms}")
-        print(f"[DEBUG] Exclude terms: {exclude_terms}")
-        print(f"[DEBUG] Sort by: {sort_by}, Reverse: {reverse}")
-        print(f"[DEBUG] Orientation: {orientation}")
+        logger.debug("Include terms: %s", include_terms)
+        logger.debug("Exclude terms: %s", exclude_terms)
+        logger.debug("Sort by: %s, Reverse: %s", sort_by, reverse)
+        logger.debug("Orientation: %s", orientation)
         
         # Update collections panel with current filters
         self.collections_panel.update_current_filters(
@@ -842,7 +905,7 @@ class MainWindow(QMainWindow):
         QCoreApplication.processEvents()
         
         # Get filtered and sorted images from index
-        print("[DEBUG] Querying image index...")
+        logger.debug("Querying image index...")
         self.filtered_images = self.image_index.filter_images(
             include_terms=include_terms,
             exclude_terms=exclude_terms,
@@ -850,10 +913,11 @@ class MainWindow(QMainWindow):
             reverse=reverse,
             orientation=orientation
         )
-        print(f"[DEBUG] Got {len(self.filtered_images)} filtered images")
+        self._path_to_index = {img.file_path: i for i, img in enumerate(self.filtered_images)}
+        logger.debug("Got %d filtered images", len(self.filtered_images))
         
         # Update UI
-        print("[DEBUG] Updating thumbnail grid...")
+        logger.debug("Updating thumbnail grid...")
         self._populate_thumbnail_grid()
         
         # Update filter bar with counts
@@ -867,39 +931,41 @@ class MainWindow(QMainWindow):
         # Reset current index
         self.current_image_index = -1
         if self.filtered_images:
-            print("[DEBUG] Showing first image...")
+            logger.debug("Showing first image...")
             self._show_image_at_index(0)
         else:
-            print("[DEBUG] No images to show")
+            logger.debug("No images to show")
     
+    @pyqtSlot(str)
     def _on_thumbnail_selected(self, file_path: str):
         """Handle thumbnail selection."""
         # Find index in filtered list
-        for i, img in enumerate(self.filtered_images):
-            if img.file_path == file_path:
-                self._show_image_at_index(i)
-                break
+        index = self._path_to_index.get(file_path)
+        if index is not None:
+            self._show_image_at_index(index)
     
+    @pyqtSlot(str, bool)
     def _on_filesystem_folder_selected(self, folder_path: str, include_subfolders: bool = True):
         """Handle folder selection from filesystem browser."""
-        print(f"[DEBUG] Filesystem folder selected: {folder_path} (include_subfolders={include_subfolders})")
+        logger.debug("Filesystem folder selected: %s (include_subfolders=%s)", folder_path, include_subfolders)
         # Load the selected folder
         self._load_folder(folder_path, recursive=include_subfolders)
         # Switch to gallery tab to show results
         self.left_tabs.setCurrentIndex(0)
     
+    @pyqtSlot(str)
     def _on_filesystem_file_selected(self, file_path: str):
         """Handle file selection from filesystem browser."""
-        print(f"[DEBUG] Filesystem file selected: {file_path}")
+        logger.debug("Filesystem file selected: %s", file_path)
         # If it's an image file, try to show it
         if file_path.lower().endswith(('.png', '.jpg', '.jpeg')):
             # Check if it's in the current filtered images
-            for i, img in enumerate(self.filtered_images):
-                if img.file_path == file_path:
-                    self._show_image_at_index(i)
-                    # Switch to gallery tab
-                    self.left_tabs.setCurrentIndex(0)
-                    return
+            index = self._path_to_index.get(file_path)
+            if index is not None:
+                self._show_image_at_index(index)
+                # Switch to gallery tab
+                self.left_tabs.setCurrentIndex(0)
+                return
             
             # If not in filtered images, load its parent folder
             parent_folder = os.path.dirname(file_path)
@@ -907,22 +973,24 @@ class MainWindow(QMainWindow):
             # Switch to gallery tab
             self.left_tabs.setCurrentIndex(0)
     
+    @pyqtSlot(str, list, list, str, bool)
     def _on_collection_filters_applied(self, name: str, include_terms: list,
                                        exclude_terms: list, sort_by: str, reverse: bool):
         """Handle collection filter application."""
-        print(f"[DEBUG] Applying collection filters: {name}")
+        logger.debug("Applying collection filters: %s", name)
         
         # Set the filter bar values
-        self.filter_bar.include_input.setText(', '.join(include_terms))
-        self.filter_bar.exclude_input.setText(', '.join(exclude_terms))
-        
-        # Set sort values if external controls exist
-        if hasattr(self.filter_bar, '_external_sort_combo'):
-            # Map sort_by value to display text
-            sort_display = {v: k for k, v in self.filter_bar.SORT_OPTIONS.items()}
-            self.filter_bar._external_sort_combo.setCurrentText(sort_display.get(sort_by, 'Date'))
-        if hasattr(self.filter_bar, '_external_reverse_checkbox'):
-            self.filter_bar._external_reverse_checkbox.setChecked(reverse)
+        self.filter_bar.set_filter_text(', '.join(include_terms), ', '.join(exclude_terms))
+        
+        # Set sort values if external controls exist; sort_changed is held
+        # back so the filters are applied once below rather than per control
+        with QSignalBlocker(self.filter_bar):
+            if hasattr(self.filter_bar, '_external_sort_combo'):
+                # Map sort_by value to display text
+                sort_display = {v: k for k, v in self.filter_bar.SORT_OPTIONS.items()}
+                self.filter_bar._external_sort_combo.setCurrentText(sort_display.get(sort_by, 'Date'))
+            if hasattr(self.filter_bar, '_external_reverse_checkbox'):
+                self.filter_bar._external_reverse_checkbox.setChecked(reverse)
         
         # Apply the filters
         self._apply_filters()
@@ -930,6 +998,7 @@ class MainWindow(QMainWindow):
         # Switch to gallery tab
         self.left_tabs.setCurrentIndex(0)
     
+    @pyqtSlot(str)
     def _on_set_collection_thumbnail(self, collection_name: str):
         """Handle request to set collection thumbnail from current image."""
         if hasattr(self, '_current_image_path') and self._current_image_path:
@@ -939,7 +1008,7 @@ class MainWindow(QMainWindow):
     
     def _populate_thumbnail_grid(self):
         """Populate thumbnail grid with current filtered images."""
-        print(f"[DEBUG] Populating thumbnail grid with {len(self.filtered_images)} images")
+        logger.debug("Populating thumbnail grid with %d images", len(self.filtered_images))
         try:
             # Disconnect and reconnect the signal to avoid duplicates
             try:
@@ -948,44 +1017,51 @@ class MainWindow(QMainWindow):
                 pass
             self.thumbnail_grid.set_images(self.filtered_images)
             self.thumbnail_grid.image_selected.connect(self._on_thumbnail_selected)
-            print("[DEBUG] Thumbnail grid populated successfully")
+            logger.debug("Thumbnail grid populated successfully")
         except Exception as e:
-            import traceback
-            print(f"[ERROR] Failed to populate thumbnail grid: {e}")
-            print(traceback.format_exc())
+            logger.exception("Failed to populate thumbnail grid: %s", e)
     
     def _show_image_at_index(self, index: int):
         """Show image at the given index."""
-        print(f"[DEBUG] Showing image at index {index}")
+        logger.debug("Showing image at index %d", index)
         if not self.filtered_images:
-            print("[DEBUG] No filtered images available")
+            logger.debug("No filtered images available")
             return
         if index < 0 or index >= len(self.filtered_images):
-            print(f"[DEBUG] Index {index} out of range (0-{len(self.filtered_images)-1})")
+            logger.debug("Index %d out of range (0-%d)", index, len(self.filtered_images) - 1)
             return
         
         self.current_image_index = index
         metadata = self.filtered_images[index]
-        print(f"[DEBUG] Loading image: {metadata.file_path}")
-        
-        # Create a copy of metadata for debugging, excluding heavy workflow data
-        debug_meta = metadata.to_dict()
-        if 'extra_params' in debug_meta and isinstance(debug_meta['extra_params'], str):
-            try:
-                params = json.loads(debug_meta['extra_params'])
-                params.pop('workflow', None)
-                params.pop('workflow_raw', None)
-                params.pop('workflow_nodes', None)
-                debug_meta['extra_params'] = params
-            except:
-                pass
-        
-        print(f"[DEBUG] Metadata: {json.dumps(debug_meta, indent=2)}")
+        logger.debug("Loading image: %s", metadata.file_path)
+        
+        # Dumping the metadata re-parses its JSON, so only do it when it is logged
+        if logger.isEnabledFor(logging.DEBUG):
+            # Create a copy of metadata for debugging, excluding heavy workflow data
+            debug_meta = metadata.to_dict()
+            if 'extra_params' in debug_meta and isinstance(debug_meta['extra_params'], str):
+                try:
+                    params = json.loads(debug_meta['extra_params'])
+                    params.pop('workflow', None)
+                    params.pop('workflow_raw', None)
+                    params.pop('workflow_nodes', None)
+                    debug_meta['extra_params'] = params
+                except:
+                    pass
+            
+            logger.debug("Metadata: %s", json.dumps(debug_meta, indent=2))
         
         try:
             # Update viewer
             self.image_viewer.load_image(metadata.file_path)
             
+            # Decode the neighbors in the background for next/previous
+            count = len(self.filtered_images)
+            self.image_viewer.set_neighbors(
+                self.filtered_images[(index - 1) % count].file_path,
+                self.filtered_images[(index + 1) % count].file_path
+            )
+            
             # Update metadata panel
             self.metadata_panel.set_metadata(metadata)
             
@@ -996,18 +1072,17 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage(
                 f"Image {index + 1} of {len(self.filtered_images)}: {metadata.file_name}"
             )
-            print(f"[DEBUG] Successfully displayed image: {metadata.file_name}")
+            logger.debug("Successfully displayed image: %s", metadata.file_name)
             
             # Store current image path for collections thumbnail feature
             self._current_image_path = metadata.file_path
         except Exception as e:
-            import traceback
-            print(f"[ERROR] Failed to show image: {e}")
-            print(traceback.format_exc())
+            logger.exception("Failed to show image: %s", e)
         self.status_bar.showMessage(
             f"Image {index + 1} of {len(self.filtered_images)}: {metadata.file_name}"
         )
     
+    @pyqtSlot()
     def _show_previous_image(self):
         """Show the previous image."""
         if not self.filtered_images:
@@ -1019,6 +1094,7 @@ class MainWindow(QMainWindow):
         
         self._show_image_at_index(new_index)
     
+    @pyqtSlot()
     def _show_next_image(self):
         """Show the next image."""
         if not self.filtered_images:
@@ -1030,6 +1106,7 @@ class MainWindow(QMainWindow):
         
         self._show_image_at_index(new_index)
     
+    @pyqtSlot()
     def _toggle_metadata_panel(self):
         """Toggle the metadata panel visibility."""
         if self.metadata_panel.isVisible():
@@ -1044,6 +1121,7 @@ class MainWindow(QMainWindow):
             self.metadata_container.setMinimumWidth(320)
             self.metadata_container.setMaximumWidth(16777215)  # QWIDGETSIZE_MAX
     
+    @pyqtSlot()
     def _toggle_gallery_panel(self):
         """Toggle the gallery panel visibility."""
         if self.left_tabs.isVisible():
@@ -1058,6 +1136,7 @@ class MainWindow(QMainWindow):
             self.gallery_container.setMinimumWidth(320)
             self.gallery_container.setMaximumWidth(16777215)  # QWIDGETSIZE_MAX
     
+    @pyqtSlot()
     def _toggle_fullscreen(self):
         """Toggle fullscreen mode."""
         if self.fullscreen_viewer:
@@ -1085,12 +1164,14 @@ class MainWindow(QMainWindow):
         # Connect click to exit
         self.fullscreen_viewer.mousePressEvent = lambda e: self._exit_fullscreen()
     
+    @pyqtSlot()
     def _exit_fullscreen(self):
         """Exit fullscreen mode."""
         if self.fullscreen_viewer:
             self.fullscreen_viewer.close()
             self.fullscreen_viewer = None
     
+    @pyqtSlot()
     def _show_slideshow_dialog(self):
         """Show the slideshow control dialog."""
         if not self.slideshow_dialog:
@@ -1103,6 +1184,7 @@ class MainWindow(QMainWindow):
         self.slideshow_dialog.show()
         self.slideshow_dialog.raise_()
     
+    @pyqtSlot(int, bool)
     def _start_slideshow(self, interval_ms: int, random_order: bool):
         """Start slideshow mode."""
         self.slideshow_random = random_order
@@ -1113,11 +1195,13 @@ class MainWindow(QMainWindow):
             random.shuffle(self.slideshow_order)
             self.slideshow_position = 0
     
+    @pyqtSlot()
     def _stop_slideshow(self):
         """Stop slideshow mode."""
         self.slideshow_random = False
         self.slideshow_order = []
     
+    @pyqtSlot()
     def _show_about(self):
         """Show about dialog."""
         QMessageBox.about(
@@ -1143,6 +1227,7 @@ class MainWindow(QMainWindow):
             self.slideshow_dialog._stop_slideshow()
         
         # Save settings
+        self.filesystem_browser.save_expanded_paths()
         self.settings.sync()
         
         event.accept()
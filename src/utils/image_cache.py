@@ -1,4 +1,5 @@
 """Image caching utilities for efficient thumbnail and preview loading."""
+from collections import OrderedDict
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 from PIL import Image
@@ -6,8 +7,35 @@ from PyQt6.QtGui import QPixmap, QImage
 import io
 
 
+def system_memory_percent() -> Optional[float]:
+    """
+    Get the share of physical memory in use.
+    
+    Returns:
+        Percentage from /proc/meminfo, or None where that is not available
+    """
+    try:
+        info = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                name, value = line.split(':', 1)
+                info[name] = int(value.split()[0])
+        return 100.0 * (1 - info['MemAvailable'] / info['MemTotal'])
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
 class ImageCache:
-    """LRU cache for loaded images with size limits."""
+    """
+    Segmented LRU cache for loaded images with size limits.
+    
+    New entries land in a probationary segment and are promoted to the
+    protected segment on their second hit, so a linear walk through a
+    folder only evicts other one-off images, not the ones revisited.
+    """
+    
+    # Share of max_cache_size reserved for entries hit more than once
+    PROTECTED_RATIO = 0.8
     
     def __init__(self, max_cache_size: int = 100, max_memory_mb: int = 200):
         """
@@ -21,7 +49,9 @@ class ImageCache:
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         
         self._cache: Dict[str, Dict] = {}
-        self._access_order: list = []
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self._max_protected = max(1, int(max_cache_size * self.PROTECTED_RATIO))
         self._current_memory = 0
     
     def get(self, file_path: str, size: Optional[Tuple[int, int]] = None) -> Optional[QPixmap]:
@@ -35,7 +65,7 @@ class ImageCache:
         Returns:
             QPixmap or None if loading failed
         """
-        cache_key = f"{file_path}_{size}"
+        cache_key = self._make_key(file_path, size)
         
         # Check if in cache
         if cache_key in self._cache:
@@ -49,6 +79,41 @@ class ImageCache:
         
         return pixmap
     
+    def contains(self, file_path: str, size: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Check whether an image is cached without loading or touching it.
+        
+        Args:
+            file_path: Path to the image file
+            size: Optional (width, height) the image was resized to
+            
+        Returns:
+            True if the image is in the cache
+        """
+        return self._make_key(file_path, size) in self._cache
+    
+    def put(self, file_path: str, pixmap: QPixmap, size: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Insert an already loaded image into the cache.
+        
+        Args:
+            file_path: Path to the image file
+            pixmap: Loaded pixmap for the file
+            size: Optional (width, height) the pixmap was resized to
+        """
+        if pixmap is None or pixmap.isNull():
+            return
+        
+        cache_key = self._make_key(file_path, size)
+        if cache_key in self._cache:
+            self._remove(cache_key)
+        self._add_to_cache(cache_key, pixmap)
+    
+    @staticmethod
+    def _make_key(file_path: str, size: Optional[Tuple[int, int]]) -> str:
+        """Build the cache key for a path and optional size."""
+        return f"{file_path}_{size}"
+    
     def _load_image(self, file_path: str, size: Optional[Tuple[int, int]]) -> Optional[QPixmap]:
         """Load an image from disk."""
         try:
@@ -86,14 +151,14 @@ class ImageCache:
             return None
     
     def _add_to_cache(self, cache_key: str, pixmap: QPixmap) -> None:
-        """Add an image to the cache with LRU eviction."""
+        """Add an image to the probationary segment with SLRU eviction."""
         # Calculate memory usage (rough estimate)
         memory_usage = pixmap.width() * pixmap.height() * 4  # 4 bytes per pixel (RGBA)
         
         # Evict entries if necessary
         while (len(self._cache) >= self.max_cache_size or 
                self._current_memory + memory_usage > self.max_memory_bytes):
-            if not self._access_order:
+            if not self._cache:
                 break
             self._evict_oldest()
         
@@ -103,28 +168,54 @@ class ImageCache:
             'memory': memory_usage
         }
         self._current_memory += memory_usage
-        self._access_order.append(cache_key)
+        self._probation[cache_key] = None
     
     def _evict_oldest(self) -> None:
-        """Remove the least recently used item from cache."""
-        if not self._access_order:
+        """Remove the least recently used item, preferring probationary entries."""
+        segment = self._probation or self._protected
+        if not segment:
             return
         
-        oldest_key = self._access_order.pop(0)
-        if oldest_key in self._cache:
-            self._current_memory -= self._cache[oldest_key]['memory']
-            del self._cache[oldest_key]
+        oldest_key, _ = segment.popitem(last=False)
+        entry = self._cache.pop(oldest_key, None)
+        if entry:
+            self._current_memory -= entry['memory']
+    
+    def _remove(self, cache_key: str) -> None:
+        """Drop a key from the cache and whichever segment holds it."""
+        self._probation.pop(cache_key, None)
+        self._protected.pop(cache_key, None)
+        self._current_memory -= self._cache.pop(cache_key)['memory']
     
     def _update_access_order(self, cache_key: str) -> None:
-        """Move accessed key to end of access order (most recent)."""
-        if cache_key in self._access_order:
-            self._access_order.remove(cache_key)
-        self._access_order.append(cache_key)
+        """Record a hit, promoting probationary keys to the protected segment."""
+        if cache_key in self._protected:
+            self._protected.move_to_end(cache_key)
+            return
+        
+        self._probation.pop(cache_key, None)
+        self._protected[cache_key] = None
+        if len(self._protected) > self._max_protected:
+            # Demote the coldest protected entry back to probation
+            demoted, _ = self._protected.popitem(last=False)
+            self._probation[demoted] = None
+    
+    def purge(self) -> int:
+        """
+        Release all cached images, e.g. under memory pressure.
+        
+        Returns:
+            Approximate number of bytes released
+        """
+        released = self._current_memory
+        self.clear()
+        return released
     
     def clear(self) -> None:
         """Clear the entire cache."""
         self._cache.clear()
-        self._access_order.clear()
+        self._probation.clear()
+        self._protected.clear()
         self._current_memory = 0
     
     def get_stats(self) -> dict:
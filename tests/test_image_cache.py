@@ -0,0 +1,94 @@
+"""Tests for the segmented LRU image cache."""
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtGui import QGuiApplication, QPixmap
+
+from src.utils.image_cache import ImageCache
+
+# QPixmap needs a GUI application
+_app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def _pixmap(width: int = 10, height: int = 10) -> QPixmap:
+    """Create a filled pixmap of the given size."""
+    pixmap = QPixmap(width, height)
+    pixmap.fill()
+    return pixmap
+
+
+def test_scan_resistance():
+    """A run of one-off images does not evict an image hit twice."""
+    cache = ImageCache(max_cache_size=5)
+    cache.put('hot', _pixmap())
+    assert cache.get('hot') is not None  # Second hit promotes it
+
+    for i in range(20):
+        cache.put(f'scan{i}', _pixmap())
+
+    assert cache.contains('hot')
+    assert not cache.contains('scan0')
+    assert cache.get_stats()['cached_images'] == 5
+
+
+def test_protected_overflow_demotes_coldest():
+    """Promoting past the protected limit demotes the coldest entry to probation."""
+    cache = ImageCache(max_cache_size=5)  # Four protected slots
+    for i in range(5):
+        cache.put(f'img{i}', _pixmap())
+        cache.get(f'img{i}')
+
+    # img0 went back to probation, so it is the first to go
+    cache.put('new', _pixmap())
+
+    assert not cache.contains('img0')
+    assert all(cache.contains(f'img{i}') for i in range(1, 5))
+    assert cache.contains('new')
+
+
+def test_memory_bound_eviction():
+    """Entries are evicted once the memory limit would be exceeded."""
+    cache = ImageCache(max_cache_size=100, max_memory_mb=1)
+    for i in range(5):
+        cache.put(f'img{i}', _pixmap(256, 256))  # 256 KB each
+
+    stats = cache.get_stats()
+    assert stats['cached_images'] == 4
+    assert stats['memory_usage_mb'] <= 1
+    assert not cache.contains('img0')
+    assert cache.contains('img4')
+
+
+def test_put_replaces_entry():
+    """Putting an existing key replaces the pixmap and its memory charge."""
+    cache = ImageCache()
+    cache.put('img', _pixmap(10, 10))
+    cache.put('img', _pixmap(20, 20))
+
+    stats = cache.get_stats()
+    assert stats['cached_images'] == 1
+    assert stats['memory_usage_mb'] * 1024 * 1024 == 20 * 20 * 4
+    assert cache.get('img').width() == 20
+
+
+def test_put_ignores_null_pixmap():
+    """A null pixmap is never cached."""
+    cache = ImageCache()
+    cache.put('img', QPixmap())
+    assert not cache.contains('img')
+
+
+def test_purge_releases_everything():
+    """purge() empties both segments and reports the bytes released."""
+    cache = ImageCache()
+    cache.put('a', _pixmap(10, 10))
+    cache.put('b', _pixmap(10, 10))
+    cache.get('b')
+
+    assert cache.purge() == 2 * 10 * 10 * 4
+    assert cache.get_stats()['cached_images'] == 0
+    assert cache.purge() == 0
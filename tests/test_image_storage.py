@@ -0,0 +1,104 @@
+"""Tests for SQLite image storage on a temporary database."""
+import hashlib
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from src.core.image_storage import ImageStorage
+from src.models.image_data import ImageMetadata
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Open an ImageStorage on a fresh database file."""
+    storage = ImageStorage(str(tmp_path / "storage.db"))
+    yield storage
+    storage.close()
+
+
+def _metadata(path: str, data: bytes) -> ImageMetadata:
+    """Build minimal metadata for a stored image."""
+    return ImageMetadata(file_path=path, file_name=os.path.basename(path),
+                         width=2, height=1, file_size=len(data))
+
+
+def test_uncommitted_store_is_visible_after_commit(storage):
+    """Reads from the pool see a commit=False store only after commit()."""
+    data = b'image-bytes'
+    assert storage.store_image(_metadata('/images/a.png', data), data, commit=False)
+    assert storage.get_image_data('/images/a.png') is None
+
+    storage.commit()
+    assert storage.get_image_data('/images/a.png') == data
+
+
+def test_is_stored_unchanged(storage, tmp_path):
+    """A stored path matches only while its content hash is unchanged."""
+    image = tmp_path / "a.png"
+    image.write_bytes(b'original')
+    path = str(image)
+    assert not storage.is_stored_unchanged(path)
+
+    storage.store_image(_metadata(path, b'original'), b'original')
+    assert storage.is_stored_unchanged(path)
+    assert storage.is_stored_unchanged(path, hashlib.sha256(b'original').hexdigest())
+
+    image.write_bytes(b'edited')
+    assert not storage.is_stored_unchanged(path)
+    assert not storage.is_stored_unchanged(path, hashlib.sha256(b'edited').hexdigest())
+
+
+def test_delete_images(storage):
+    """delete_images removes rows, or only flags them with delete_data=False."""
+    for name in ('a', 'b', 'c'):
+        path = f'/images/{name}.png'
+        storage.store_image(_metadata(path, name.encode()), name.encode())
+
+    assert storage.delete_images(['/images/a.png', '/images/b.png'], delete_data=False) == 2
+    stats = storage.get_storage_stats()
+    assert stats['total_images'] == 3
+    assert stats['deleted_originals'] == 2
+
+    assert storage.delete_images(['/images/a.png', '/images/missing.png']) == 1
+    assert storage.get_image_data('/images/a.png') is None
+    assert storage.get_storage_stats()['total_images'] == 2
+
+
+def test_table_fingerprint_tracks_writes(storage):
+    """The fingerprint is stable between writes and changes after each one."""
+    empty = storage.get_table_fingerprint()
+    assert storage.get_table_fingerprint() == empty
+
+    storage.store_image(_metadata('/images/a.png', b'a'), b'a')
+    stored = storage.get_table_fingerprint()
+    assert stored != empty
+
+    storage.delete_images(['/images/a.png'], delete_data=False)
+    flagged = storage.get_table_fingerprint()
+    assert flagged != stored
+
+    storage.delete_images(['/images/a.png'])
+    assert storage.get_table_fingerprint() not in (stored, flagged)
+
+
+def test_read_pool_opens_lazily(storage):
+    """Read-only connections are opened on first use, not at construction."""
+    assert storage._ro_open == 0
+    storage.get_image_data('/images/missing.png')
+    storage.get_image_data('/images/missing.png')
+    assert storage._ro_open == 1
+
+
+def test_in_memory_database_reads_through_main_connection():
+    """An in-memory database serves reads without a read-only pool."""
+    storage = ImageStorage(':memory:')
+    try:
+        storage.store_image(_metadata('/images/a.png', b'a'), b'a')
+        assert storage.get_image_data('/images/a.png') == b'a'
+        assert storage._ro_open == 0
+    finally:
+        storage.close()
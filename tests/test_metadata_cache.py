@@ -0,0 +1,92 @@
+"""Tests for the per-folder metadata cache and its use by the folder loader."""
+import json
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PIL import Image
+
+from src.core.image_scanner import ImageScanner
+from src.core.metadata_cache import MetadataCache
+from src.ui.folder_loader import FolderLoaderThread
+
+
+def _make_folder(root):
+    """Create a folder with a PNG, a WebP and a PNG in a subfolder."""
+    folder = root / "images"
+    (folder / "sub").mkdir(parents=True)
+    Image.new('RGB', (8, 4)).save(folder / "a.png")
+    Image.new('RGB', (4, 8)).save(folder / "b.webp")
+    Image.new('RGB', (6, 6)).save(folder / "sub" / "c.png")
+    return str(folder)
+
+
+def _count_saves(monkeypatch):
+    """Record every save_cache call made through MetadataCache."""
+    saves = []
+    original = MetadataCache.save_cache
+
+    def save_cache(self, folder_path, metadata_list):
+        saves.append(len(metadata_list))
+        return original(self, folder_path, metadata_list)
+
+    monkeypatch.setattr(MetadataCache, 'save_cache', save_cache)
+    return saves
+
+
+def _load(folder, recursive=True):
+    """Run the folder loader synchronously and return the loaded images."""
+    loader = FolderLoaderThread(folder, use_cache=True, recursive=recursive)
+    loaded = []
+    loader.loading_complete.connect(loaded.append)
+    loader.run()
+    return loaded[0]
+
+
+def test_repeat_load_is_served_from_cache(tmp_path, monkeypatch):
+    """A second load of an unchanged folder, WebP included, reads the cache."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    folder = _make_folder(tmp_path)
+    saves = _count_saves(monkeypatch)
+
+    first = _load(folder)
+    second = _load(folder)
+
+    assert saves == [3]
+    assert sorted(m.file_path for m in second) == sorted(m.file_path for m in first)
+
+
+def test_rescan_matching_cache_skips_rewrite(tmp_path, monkeypatch):
+    """A rescan that reproduces the cached contents does not rewrite them."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    folder = _make_folder(tmp_path)
+    saves = _count_saves(monkeypatch)
+
+    # Non-recursive loads cache only the top level, so validation against
+    # the whole tree fails and the folder is rescanned every time
+    _load(folder, recursive=False)
+    images = _load(folder, recursive=False)
+
+    assert saves == [2]
+    assert len(images) == 2
+
+
+def test_unreadable_cache_has_no_signature(tmp_path):
+    """A cache whose entries cannot be rebuilt never vouches for a rescan."""
+    folder = _make_folder(tmp_path)
+    cache = MetadataCache(str(tmp_path / "cache"))
+    cache.save_cache(folder, ImageScanner().scan_directory(folder))
+
+    cache_file = cache._get_cache_file(folder)
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for entry in data['files'].values():
+        entry['metadata'] = None
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    fresh = MetadataCache(str(tmp_path / "cache"))
+    assert fresh.load_cache(folder) is None
+    assert fresh.get_signature(folder) is None